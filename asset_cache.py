@@ -0,0 +1,89 @@
+import os
+from collections import OrderedDict
+from file_operations import load_point_cloud
+
+class AssetCache:
+    """
+    Bounded in-memory LRU cache for decoded static assets (point-cloud text files).
+
+    Entries are keyed by asset path plus modification time, so an asset edited on disk
+    is transparently reloaded. The total size of the cached arrays never exceeds the byte budget;
+    the least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_bytes):
+        """
+        Args:
+            max_bytes (int): Maximum number of bytes held by cached arrays. 0 disables caching.
+        """
+        self.max_bytes = int(max_bytes)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        # Worker processes start with an empty cache of the same budget instead of a copy of the entries
+        state = self.__dict__.copy()
+        state.update(current_bytes=0, hits=0, misses=0, evictions=0, _entries=OrderedDict())
+        return state
+
+    def get(self, file_path, loader=load_point_cloud):
+        """
+        Returns the decoded array for a file, loading it on a miss.
+
+        The returned array is shared with the cache and must not be modified in place.
+
+        Args:
+            file_path (str): Path to the asset file.
+            loader (callable, optional): Function decoding the file into a numpy array. Default is load_point_cloud.
+
+        Returns:
+            numpy.ndarray: Decoded asset data.
+        """
+        key = (os.path.abspath(file_path), os.stat(file_path).st_mtime_ns)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+        self.misses += 1
+        data = loader(file_path)
+        self._insert(key, data)
+        return data
+
+    def _insert(self, key, data):
+        size = data.nbytes
+        if size > self.max_bytes:
+            return
+
+        # Drop stale versions of the same asset before making room for the new one
+        for stale_key in [k for k in self._entries if k[0] == key[0]]:
+            self.current_bytes -= self._entries.pop(stale_key).nbytes
+
+        while self._entries and self.current_bytes + size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted.nbytes
+            self.evictions += 1
+
+        data.setflags(write=False)
+        self._entries[key] = data
+        self.current_bytes += size
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def summary(self):
+        """
+        Returns a one-line human readable summary of the cache counters.
+        """
+        lookups = self.hits + self.misses
+        hit_rate = 100.0 * self.hits / lookups if lookups else 0.0
+        return (f"Asset cache: {self.hits} hits, {self.misses} misses ({hit_rate:.1f}% hit rate), "
+                f"{self.evictions} evictions, {len(self._entries)} entries, "
+                f"{self.current_bytes / 1024**2:.1f}/{self.max_bytes / 1024**2:.1f} MB used.")
@@ -0,0 +1,149 @@
+import os
+import numpy as np
+from file_operations import save_ply, save_ply_by_actor
+from ply_reader import read_ply, read_ply_header
+
+KEYFRAME_EXTENSION = ".ply"
+DELTA_EXTENSION = ".delta"
+
+def _rendered_byte(block):
+    """
+    Returns the rendered value of an actor block as it is stored in the PLY body.
+    """
+    if len(block) == 0:
+        return 0
+    return int(np.asarray(block[:1, -1], dtype=np.float32).astype(np.uint8)[0])
+
+def write_keyframe(file_path, blocks_by_actor, config):
+    """
+    Writes a keyframe: the full dynamic point set, with one header comment per actor giving its name and point count.
+    A keyframe is a regular PLY file.
+
+    Args:
+        file_path (str): Path of the keyframe PLY file.
+        blocks_by_actor (dict): Actor names mapped to their processed (N, K) point blocks.
+        config (Config): Configuration object containing parameters for saving.
+    """
+    save_ply_by_actor(file_path, blocks_by_actor, config)
+
+def write_delta(file_path, blocks_by_actor, keyframe_blocks, keyframe_name, config):
+    """
+    Writes a delta frame relative to its keyframe. Actors whose points differ from the keyframe are stored in full,
+    actors with identical points only store their new rendered value.
+
+    Args:
+        file_path (str): Path of the delta file.
+        blocks_by_actor (dict): Actor names mapped to the processed point blocks of this frame.
+        keyframe_blocks (dict): Actor names mapped to the point blocks of the keyframe.
+        keyframe_name (str): File name of the keyframe the delta refers to.
+        config (Config): Configuration object containing parameters for saving.
+    """
+    comments = [f"keyframe {keyframe_name}"]
+    changed_blocks = []
+    for name, block in blocks_by_actor.items():
+        reference = keyframe_blocks.get(name)
+        if reference is not None and reference.shape == block.shape and np.array_equal(reference[:, :-1], block[:, :-1]):
+            comments.append(f"keep {name} {_rendered_byte(block)}")
+        else:
+            comments.append(f"actor {name} {len(block)}")
+            changed_blocks.append(block)
+    points = np.concatenate(changed_blocks) if changed_blocks else np.array([], dtype=np.float32)
+    save_ply(file_path, points, config, comments)
+
+def keyframe_name(comments):
+    """
+    Returns the file name of the keyframe a delta file refers to, from its header comments.
+    """
+    return next((comment.split(" ", 1)[1] for comment in comments if comment.startswith("keyframe ")), None)
+
+def delta_keyframe(file_path):
+    """
+    Returns the file name of the keyframe a delta file refers to, reading only its header.
+    """
+    return keyframe_name(read_ply_header(file_path)[3])
+
+def split_actor_blocks(points, comments):
+    """
+    Splits the vertices of a keyframe or delta file into per-actor blocks using its actor comments.
+
+    Returns:
+        list: (action, actor name, block or rendered value) tuples in frame order, where action is 'actor' or 'keep'.
+    """
+    entries = []
+    offset = 0
+    for comment in comments:
+        action, _, rest = comment.partition(" ")
+        if action not in ("actor", "keep"):
+            continue
+        # Actor names may contain spaces, the value is always the last field
+        name, value = rest.rsplit(" ", 1)
+        if action == "actor":
+            count = int(value)
+            entries.append(("actor", name, points[offset:offset + count]))
+            offset += count
+        else:
+            entries.append(("keep", name, int(value)))
+    return entries
+
+def find_frame_file(folder, frame_number):
+    """
+    Returns the path of the keyframe or delta file holding a frame, or None if there is none.
+    """
+    for extension in (KEYFRAME_EXTENSION, DELTA_EXTENSION):
+        file_path = os.path.join(folder, f"frame_{frame_number}{extension}")
+        if os.path.exists(file_path):
+            return file_path
+    return None
+
+def load_frame_blocks(folder, frame_number):
+    """
+    Reads the dynamic points of a frame as per-actor blocks, rebuilding delta frames from their keyframe.
+    Only the frame's own file and its keyframe are read.
+
+    Args:
+        folder (str): Path to the DynamicActors output folder.
+        frame_number (int): Number of the frame to load.
+
+    Returns:
+        tuple: (list of (actor name, structured block) pairs in frame order, dtype of the frame, header comments of the frame).
+            Files written without actor comments yield a single block named None.
+    """
+    file_path = find_frame_file(folder, frame_number)
+    if file_path is None:
+        raise FileNotFoundError(f"Frame {frame_number} not found in '{folder}'.")
+
+    points, comments = read_ply(file_path)
+    entries = split_actor_blocks(points, comments)
+    if file_path.endswith(KEYFRAME_EXTENSION):
+        if not entries:
+            return [(None, points)], points.dtype, comments
+        return [(name, block) for _, name, block in entries], points.dtype, comments
+
+    keyframe_points, keyframe_comments = read_ply(os.path.join(folder, keyframe_name(comments)))
+    keyframe_blocks = {name: block for _, name, block in split_actor_blocks(keyframe_points, keyframe_comments)}
+
+    blocks = []
+    for action, name, value in entries:
+        if action == "actor":
+            blocks.append((name, value))
+        else:
+            block = np.array(keyframe_blocks[name])
+            block["rendered"] = value
+            blocks.append((name, block))
+    return blocks, points.dtype, comments
+
+def load_frame(folder, frame_number):
+    """
+    Reconstructs the full dynamic point set of a frame from a DynamicActors folder, delta-encoded or not.
+
+    Args:
+        folder (str): Path to the DynamicActors output folder.
+        frame_number (int): Number of the frame to load.
+
+    Returns:
+        numpy.ndarray: Structured array with the same records as a full frame_N.ply.
+    """
+    blocks, point_dtype, _ = load_frame_blocks(folder, frame_number)
+    if len(blocks) == 1:
+        return blocks[0][1]
+    return np.concatenate([block for _, block in blocks]) if blocks else np.empty(0, dtype=point_dtype)
@@ -4,6 +4,8 @@ import re
 import sys
 import math
 from tqdm import tqdm
+from visibility_scores import VisibilityScores, polynomial_function
+from frame_cache import load_frame_cache, write_frame_cache, frame_signature, pack_frame
 
 def parse_rendering_states_from_frame(filepath):
     """
@@ -32,26 +34,13 @@ def parse_rendering_states_from_frame(filepath):
 
     return actors
 
-def polynomial_function(x):
+def sort_frame_files(frame_files):
     """
-    Evaluates the polynomial function based on the given coefficients.
-
-    Args:
-        x (float or numpy array): Input value(s) for which the polynomial is evaluated.
-
-    Returns:
-        float or numpy array: Result of the polynomial evaluation.
+    Keeps the frame_N.txt files of a list and sorts them by frame number.
     """
-    # Coefficients of the polynomial: [a3, a2, a1, a0]
-    a3 = 2.31481481e-6
-    a2 = -1.66666667e-3
-    a1 = 3.91666667e-1
-    a0 = 3.00000000e+1
-    
-    # Compute polynomial: a3*x^3 + a2*x^2 + a1*x + a0
-    y = a3 * np.power(x, 3) + a2 * np.power(x, 2) + a1 * x + a0
-    
-    return y
+    frame_files = [frame for frame in frame_files if frame.startswith('frame_') and frame.endswith('.txt')]
+    frame_files.sort(key=lambda x: int(re.findall(r'\d+', x)[0]))  # Sort frame files by their frame number
+    return frame_files
 
 def generate_dynamic_rendering_dict(base_path, experiment_dict):
     """
@@ -63,7 +52,7 @@ def generate_dynamic_rendering_dict(base_path, experiment_dict):
         experiment_dict (dict): A dictionary where keys are experiment names and values are lists of participant names.
 
     Returns:
-        dict: A nested dictionary with the structure {Experiment: {Participant: {Actor: [rendering state counts]}}}.
+        dict: A nested dictionary with the structure {Experiment: {Participant: VisibilityScores}}.
     """
     data = {}
     
@@ -90,47 +79,14 @@ def generate_dynamic_rendering_dict(base_path, experiment_dict):
             if not os.path.isdir(dynamic_actors_path):
                 continue
 
-            actor_frames = {}
-            frame_files = [frame for frame in os.listdir(dynamic_actors_path) if frame.startswith('frame_') and frame.endswith('.txt')]
-            frame_files.sort(key=lambda x: int(re.findall(r'\d+', x)[0]))  # Sort frame files by their frame number
+            frame_states = []
+            frame_files = sort_frame_files(os.listdir(dynamic_actors_path))
 
             for frame_file in tqdm(frame_files, desc=f"Processing Frames in {participant}", leave=False):
                 frame_path = os.path.join(dynamic_actors_path, frame_file)
+                frame_states.append(parse_rendering_states_from_frame(frame_path))
 
-                frame_data = parse_rendering_states_from_frame(frame_path)
-                for actor, rendered in frame_data.items():
-                    if actor not in actor_frames:
-                        actor_frames[actor] = []
-                    actor_frames[actor].append(rendered)
-
-            # Transform rendering states to counts and handle transitions from Yes to No
-            transformed_actor_frames = {}
-            for actor, bool_list in actor_frames.items():
-                if isinstance(bool_list, list):
-                    continuous_true_count = 0
-                    transformed_scores = []
-                    forget_rate = 14/15  # Define the forget rate
-
-                    for value in bool_list:
-                        if value:
-                            continuous_true_count += 1
-                            score = polynomial_function(continuous_true_count)
-                            # Ensure the score doesn't exceed the max value
-                            if score > 60:
-                                score = 60
-                        else:
-                            if transformed_scores:
-                                # Apply the forget rate to the last score
-                                score = np.floor(transformed_scores[-1] * forget_rate)
-                            else:
-                                score = 0  # Or some default value when no previous score exists
-                            continuous_true_count = 0
-                            
-                        transformed_scores.append(score)
-
-                    transformed_actor_frames[actor] = transformed_scores
-
-            participants_data[participant] = transformed_actor_frames
+            participants_data[participant] = VisibilityScores.from_frame_states(frame_states)
         data[experiment] = participants_data
 
     return data
@@ -141,7 +97,7 @@ def fetch_visibility_score(path, data_dict):
 
     Args:
         path (str): The path to the frame file.
-        data_dict (dict): The dictionary with the structure {Experiment: {Participant: {Actor: [rendering state counts]}}}.
+        data_dict (dict): The dictionary with the structure {Experiment: {Participant: VisibilityScores}}.
 
     Returns:
         dict or None: The visibility scores for the frame if found, otherwise None.
@@ -160,18 +116,7 @@ def fetch_visibility_score(path, data_dict):
         
         # Validate the experiment and participant existence
         if experiment in data_dict and participant in data_dict[experiment]:
-            actors_rendering_states = data_dict[experiment][participant]
-            
-            # Prepare result dictionary
-            frame_data = {}
-            
-            for actor, counts in actors_rendering_states.items():
-                if frame_number - 1 < len(counts):
-                    frame_data[actor] = counts[frame_number - 1]
-                else:
-                    frame_data[actor] = None
-            
-            return frame_data
+            return data_dict[experiment][participant].frame_scores(frame_number)
         
         return None
     
@@ -217,37 +162,40 @@ def generate_output_file_name(input_file_path):
         output_file_name = f"{name}.ply"
     return output_file_name
 
-def save_ply(file_path, points, config):
+# PLY type, numpy type and range of the integer steps of each quantized coordinate encoding
+QUANTIZED_TYPES = {"uint16": ("ushort", np.uint16), "int32": ("int", np.int32)}
+
+def get_ply_properties(config):
     """
-    Save points to a PLY file.
+    Build the PLY header and matching structured dtype for the configured point layout.
 
     Parameters:
-    file_path (str): Path to the output PLY file.
-    points (numpy.ndarray): Array of point data to save.
-    config (Config): Configuration object containing parameters for saving.
+    config (Config): Configuration object containing the float precision and color modes.
+
+    Returns:
+    tuple: (header properties as str, list of (name, dtype) pairs), without the element count and end_header lines.
     """
-    
-    # Extract configuration parameters
     float_precision = config.float_precision
     light_color = config.light_color
     material_color = config.material_color
-    ply_format = config.ply_format
-
-    if float_precision == 16:
-        dtype = np.float16
+    coordinate_encoding = getattr(config, 'coordinate_encoding', "Float")
+
+    if coordinate_encoding in QUANTIZED_TYPES:
+        coordinate_type, dtype = QUANTIZED_TYPES[coordinate_encoding]
+    elif coordinate_encoding != "Float":
+        raise ValueError("Invalid coordinate encoding. Use 'Float', 'uint16', or 'int32'.")
+    elif float_precision == 16:
+        coordinate_type, dtype = "float16", np.float16
     elif float_precision == 32:
-        dtype = np.float32
+        coordinate_type, dtype = "float32", np.float32
     elif float_precision == 64:
-        dtype = np.float64
+        coordinate_type, dtype = "float64", np.float64
     else:
         raise ValueError("Invalid float precision. Use '16', '32', or '64'.")
-    
-    header = f"""ply
-format {'binary_little_endian' if ply_format == 'Binary' else 'ascii'} 1.0
-element vertex {len(points)}
-property float{float_precision} x
-property float{float_precision} y
-property float{float_precision} z
+
+    header = f"""property {coordinate_type} x
+property {coordinate_type} y
+property {coordinate_type} z
 """
     point_dtype = [('x', dtype), ('y', dtype), ('z', dtype)]
     
@@ -279,21 +227,225 @@ property float{float_precision} z
     
     header += "property uchar rendered\n"
     point_dtype += [("rendered", np.uint8)]
+
+    return header, point_dtype
+
+def to_structured_points(points, point_dtype, columns=None):
+    """
+    Fill a preallocated structured array column by column from a (N, K) point matrix.
+
+    Parameters:
+    points (numpy.ndarray): Array of point data, one column per property.
+    point_dtype (list): List of (name, dtype) pairs describing the properties.
+    columns (dict, optional): Property names mapped to values replacing the matching point column. Default is None.
+
+    Returns:
+    numpy.ndarray: Structured array with one record per point.
+    """
+    structured_points = np.empty(len(points), dtype=point_dtype)
+    if len(points) == 0:
+        return structured_points
+
+    points = np.asarray(points)
+    if points.ndim != 2 or points.shape[1] != len(point_dtype):
+        raise ValueError(f"Point data has {points.shape[-1]} columns but the PLY layout expects {len(point_dtype)}.")
+
+    for column, (name, _) in enumerate(point_dtype):
+        structured_points[name] = columns[name] if columns and name in columns else points[:, column]
+    return structured_points
+
+def quantize_coordinates(coordinates, config):
+    """
+    Convert coordinates to integer steps of a fixed scale from an offset, so that decoding them as
+    offset + step * scale is off by at most the configured error bound.
+
+    The scale is twice config.quantization_error. The offset is config.quantization_offset when it is set
+    (bounding box minimum of the experiment), otherwise the bounding box minimum of the coordinates.
+
+    Parameters:
+    coordinates (numpy.ndarray): (N, 3) array of x, y, z values.
+    config (Config): Configuration object containing the coordinate encoding and error bound.
+
+    Returns:
+    tuple: ((N, 3) array of integer steps, list of header comments recording the scale and offset)
+    """
+    _, dtype = QUANTIZED_TYPES[config.coordinate_encoding]
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    scale = 2.0 * config.quantization_error
+    offset = getattr(config, 'quantization_offset', None)
+    if offset is None:
+        offset = coordinates.min(axis=0) if len(coordinates) else np.zeros(3)
+    offset = np.asarray(offset, dtype=np.float64)
+
+    steps = np.rint((coordinates - offset) / scale)
+    limits = np.iinfo(dtype)
+    if len(steps) and (steps.min() < limits.min or steps.max() > limits.max):
+        raise ValueError(f"Coordinates from {coordinates.min(axis=0)} to {coordinates.max(axis=0)} do not fit {config.coordinate_encoding} "
+                         f"steps of {scale} from offset {offset}. Use int32 coordinates or a larger quantization error.")
+
+    comments = [f"quantization_scale {scale!r}", "quantization_offset " + " ".join(repr(float(value)) for value in offset)]
+    return steps.astype(dtype), comments
+
+def encode_points(points, config):
+    """
+    Convert a (N, K) point matrix to the structured PLY records of the configured layout.
+
+    Parameters:
+    points (numpy.ndarray): Array of point data, one column per property.
+    config (Config): Configuration object containing parameters for saving.
+
+    Returns:
+    tuple: (structured array of the records, list of header comments required to decode them)
+    """
+    _, point_dtype = get_ply_properties(config)
+    if getattr(config, 'coordinate_encoding', "Float") == "Float":
+        return to_structured_points(points, point_dtype), []
+
+    points = np.asarray(points)
+    coordinates = points[:, :3] if len(points) else np.zeros((0, 3))
+    steps, comments = quantize_coordinates(coordinates, config)
+    columns = {'x': steps[:, 0], 'y': steps[:, 1], 'z': steps[:, 2]}
+    return to_structured_points(points, point_dtype, columns), comments
+
+def save_ply(file_path, points, config, comments=None):
+    """
+    Save points to a PLY file.
+
+    Parameters:
+    file_path (str): Path to the output PLY file.
+    points (numpy.ndarray): Array of point data to save.
+    config (Config): Configuration object containing parameters for saving.
+    comments (list, optional): Lines written as PLY comments in the header. Default is None.
+    """
+    # Write the columns straight into the structured record buffer
+    structured_points, encoding_comments = encode_points(points, config)
+    write_ply_records(file_path, structured_points, config, list(comments or []) + encoding_comments)
+
+def write_ply_records(file_path, structured_points, config, comments=None):
+    """
+    Write structured PLY records, as returned by encode_points, to a PLY file.
+
+    Parameters:
+    file_path (str): Path to the output PLY file.
+    structured_points (numpy.ndarray): Structured array with the configured point layout.
+    config (Config): Configuration object containing parameters for saving.
+    comments (list, optional): Lines written as PLY comments in the header. Default is None.
+    """
+    ply_format = config.ply_format
+    properties, point_dtype = get_ply_properties(config)
+
+    header = f"""ply
+format {'binary_little_endian' if ply_format == 'Binary' else 'ascii'} 1.0
+"""
+    for comment in comments or []:
+        header += f"comment {comment}\n"
+    header += f"element vertex {len(structured_points)}\n"
+    header += properties
     header += "end_header\n"
     
     # Create directory if it does not exist
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
     
-    # Ensure points array matches the structured dtype
-    structured_points = np.array([tuple(point) for point in points], dtype=point_dtype)
-    with open(file_path, 'wb' if ply_format == 'Binary' else 'w') as file:
+    # Write to a temporary file first so a half-written PLY never takes the final name
+    temp_path = file_path + ".tmp"
+    with open(temp_path, 'wb' if ply_format == 'Binary' else 'w') as file:
         file.write(header.encode('utf-8') if ply_format == 'Binary' else header)
         if ply_format == 'Binary':
             structured_points.tofile(file)
         else:
             # Create a format string for ASCII output
-            fmt = ' '.join(['%f' if dt[1] == dtype else '%d' for dt in point_dtype])
+            fmt = ' '.join(['%d' if np.issubdtype(dt[1], np.integer) else '%f' for dt in point_dtype])
             np.savetxt(file, structured_points, fmt=fmt)
+    os.replace(temp_path, file_path)
+
+def merge_actor_points(points_by_actor):
+    """
+    Concatenate the point blocks of several actors and describe them as PLY header comments.
+
+    Parameters:
+    points_by_actor (dict): Actor names mapped to their (N, K) point blocks, in file order.
+
+    Returns:
+    tuple: (concatenated points, list of 'actor <name> <count>' comments)
+    """
+    comments = [f"actor {name} {len(points)}" for name, points in points_by_actor.items()]
+    points = np.concatenate(list(points_by_actor.values())) if points_by_actor else np.array([], dtype=np.float32)
+    return points, comments
+
+def progressive_order(num_points):
+    """
+    Order points so that every prefix of the order is spread evenly over the original sequence.
+    Indices are sorted by their bit-reversed value: the first half takes every second point, the first quarter every fourth, and so on.
+
+    Parameters:
+    num_points (int): Number of points.
+
+    Returns:
+    numpy.ndarray: Permutation of range(num_points).
+    """
+    indices = np.arange(num_points, dtype=np.int64)
+    bits = max(1, (num_points - 1).bit_length())
+    reversed_indices = np.zeros_like(indices)
+    for bit in range(bits):
+        reversed_indices |= ((indices >> bit) & 1) << (bits - 1 - bit)
+    return np.argsort(reversed_indices)
+
+def lod_point_counts(num_points, levels, ratio):
+    """
+    Number of points of an actor at each level of detail, from the coarsest to the full set.
+
+    Parameters:
+    num_points (int): Number of points of the actor at full density.
+    levels (int): Number of levels.
+    ratio (float): Share of the points of a level kept by the next coarser level.
+
+    Returns:
+    list: Non-decreasing point counts, the last one being num_points.
+    """
+    return [int(np.ceil(num_points * ratio ** (levels - 1 - level))) for level in range(levels - 1)] + [num_points]
+
+def merge_lod_points(points_by_actor, levels, ratio):
+    """
+    Concatenate the point blocks of several actors as nested levels of detail: the points of the coarsest level
+    come first and every level adds the points missing from the previous one, so each level is a prefix of the file.
+
+    Parameters:
+    points_by_actor (dict): Actor names mapped to their (N, K) point blocks at full density.
+    levels (int): Number of levels.
+    ratio (float): Share of the points of a level kept by the next coarser level.
+
+    Returns:
+    tuple: (reordered points, list of 'lod <level> <count>' comments giving the number of points of each level)
+    """
+    ordered = {name: points[progressive_order(len(points))] for name, points in points_by_actor.items()}
+    counts = {name: lod_point_counts(len(points), levels, ratio) for name, points in points_by_actor.items()}
+
+    segments = []
+    comments = []
+    total = 0
+    for level in range(levels):
+        for name, points in ordered.items():
+            start = counts[name][level - 1] if level else 0
+            segments.append(points[start:counts[name][level]])
+            total += counts[name][level] - start
+        comments.append(f"lod {level} {total}")
+    segments = [segment for segment in segments if len(segment)]
+    points = np.concatenate(segments) if segments else np.array([], dtype=np.float32)
+    return points, comments
+
+def save_ply_by_actor(file_path, points_by_actor, config, comments=None):
+    """
+    Save the points of several actors to one PLY file, with one header comment per actor giving its name and point count.
+    The vertices are those of save_ply on the concatenated points; the comments let readers split them by actor again.
+
+    Parameters:
+    file_path (str): Path to the output PLY file.
+    points_by_actor (dict): Actor names mapped to their (N, K) point blocks, in file order.
+    config (Config): Configuration object containing parameters for saving.
+    comments (list, optional): Additional comment lines written before the actor comments. Default is None.
+    """
+    points, actor_comments = merge_actor_points(points_by_actor)
+    save_ply(file_path, points, config, list(comments or []) + actor_comments)
 
 def check_actor_type(line):
     if line.endswith("(Rectangular Prism):"):
@@ -340,7 +492,29 @@ def extract_values(line):
             return "Points", tuple(float(value) for value in values)
     return None, None
 
-def read_attributes_from_file(file_path, config):
+def parse_frame_attributes(file_path):
+    """
+    Parses the actors of a frame file with their raw rendering states (1 for Yes, 0 for No).
+
+    Args:
+        file_path (str): Path to the frame file.
+
+    Returns:
+        tuple: Lists of prism, sphere and point cloud attribute dictionaries.
+    """
+    with open(file_path, 'r') as file:
+        return parse_frame_lines(file)
+
+def parse_frame_lines(lines):
+    """
+    Parses the actors of a frame from the lines of its file, see parse_frame_attributes.
+
+    Args:
+        lines (iterable): Lines of the frame file.
+
+    Returns:
+        tuple: Lists of prism, sphere and point cloud attribute dictionaries.
+    """
     prisms = []
     spheres = []
     point_clouds = []
@@ -348,45 +522,117 @@ def read_attributes_from_file(file_path, config):
     current_actor_name = None
     current_actor_attributes = {}
 
+    for line in lines:
+        line = line.strip()
+        actor_type = check_actor_type(line)
+        if actor_type:
+            # If we already have attributes collected for the previous actor, append it to the appropriate list
+            if current_actor_attributes:
+                current_actor_attributes["Name"] = current_actor_name
+                if current_actor_type == "Rectangular Prism":
+                    prisms.append(current_actor_attributes)
+                elif current_actor_type == "Sphere":
+                    spheres.append(current_actor_attributes)
+                elif current_actor_type == "Point Cloud":
+                    point_clouds.append(current_actor_attributes)
+            # Reset for the new actor
+            current_actor_type = actor_type
+            current_actor_name = line.split()[0]
+            current_actor_attributes = {"Type": actor_type}
+        else:
+            line_type, values = extract_values(line)
+            if line_type:
+                if line_type == "Points":
+                    current_actor_attributes.setdefault("Points", []).append(values)
+                else:
+                    current_actor_attributes[line_type] = values
+
+    # Append the last actor's attributes if any
+    if current_actor_attributes:
+        current_actor_attributes["Name"] = current_actor_name
+        if current_actor_type == "Rectangular Prism":
+            prisms.append(current_actor_attributes)
+        elif current_actor_type == "Sphere":
+            spheres.append(current_actor_attributes)
+        elif current_actor_type == "Point Cloud":
+            point_clouds.append(current_actor_attributes)
+
+    return prisms, spheres, point_clouds
+
+def apply_visibility_scores(entity_lists, actor_rendering_dict):
+    """
+    Replaces the raw rendering states of parsed actors with their visibility scores, in place.
+
+    Args:
+        entity_lists (tuple): Lists of actor attribute dictionaries, as returned by parse_frame_attributes.
+        actor_rendering_dict (dict or None): Actor names mapped to their visibility score for the frame.
+
+    Returns:
+        tuple: The same lists of actor attribute dictionaries.
+    """
+    if actor_rendering_dict:
+        for entities in entity_lists:
+            for entity in entities:
+                if "Rendered" in entity:
+                    entity["Rendered"] = actor_rendering_dict[entity["Name"]]
+    return entity_lists
+
+def read_attributes_from_file(file_path, config):
     actor_rendering_dict = fetch_visibility_score(file_path, config.dynamic_actors_rendering_dict)
+    return apply_visibility_scores(parse_frame_attributes(file_path), actor_rendering_dict)
 
-    with open(file_path, 'r') as file:
-        for line in file:
-            line = line.strip()
-            actor_type = check_actor_type(line)
-            if actor_type:
-                # If we already have attributes collected for the previous actor, append it to the appropriate list
-                if current_actor_attributes:
-                    current_actor_attributes["Name"] = current_actor_name
-                    if current_actor_type == "Rectangular Prism":
-                        prisms.append(current_actor_attributes)
-                    elif current_actor_type == "Sphere":
-                        spheres.append(current_actor_attributes)
-                    elif current_actor_type == "Point Cloud":
-                        point_clouds.append(current_actor_attributes)
-                # Reset for the new actor
-                current_actor_type = actor_type
-                current_actor_name = line.split()[0]
-                current_actor_attributes = {"Type": actor_type}
-            else:
-                line_type, values = extract_values(line)
-                if line_type:
-                    if line_type == "Points":
-                        current_actor_attributes.setdefault("Points", []).append(values)
-                    
-                    elif line_type =="Rendered" and actor_rendering_dict:
-                        current_actor_attributes[line_type] = actor_rendering_dict[current_actor_name]
-                    else:
-                        current_actor_attributes[line_type] = values
-
-        # Append the last actor's attributes if any
-        if current_actor_attributes:
-            current_actor_attributes["Name"] = current_actor_name
-            if current_actor_type == "Rectangular Prism":
-                prisms.append(current_actor_attributes)
-            elif current_actor_type == "Sphere":
-                spheres.append(current_actor_attributes)
-            elif current_actor_type == "Point Cloud":
-                point_clouds.append(current_actor_attributes)
+def ingest_participant_frames(frames_path, selected_frames, cache_path=None):
+    """
+    Reads every frame file of a participant exactly once. The rendering states of all frames are kept
+    to compute the visibility scores, and the selected frames are kept for conversion as compact PackedFrames,
+    which the conversion decodes one frame at a time.
 
-    return prisms, spheres, point_clouds
+    If a cache path is given, frames are taken from the binary frame cache when their source file is unchanged,
+    and the cache is rewritten when any frame had to be parsed from text.
+
+    Args:
+        frames_path (str): Path to the DynamicActors folder of the participant.
+        selected_frames (list): Frame file names that will be converted.
+        cache_path (str, optional): Folder of the binary frame cache of the participant. Default is None.
+
+    Returns:
+        tuple: (dict of frame name to PackedFrame, VisibilityScores of the participant)
+    """
+    selected_frames = set(selected_frames)
+    parsed_frames = {}
+    frame_states = []
+    frame_files = sort_frame_files(os.listdir(frames_path))
+
+    frame_cache = None
+    signatures = None
+    stale = False
+    if cache_path:
+        frame_cache = load_frame_cache(cache_path)
+        signatures = [frame_signature(os.path.join(frames_path, frame_file)) for frame_file in frame_files]
+        stale = (frame_cache is None or len(frame_cache.frames) != len(frame_files)
+                 or not all(frame_cache.is_valid(frame_file, signature) for frame_file, signature in zip(frame_files, signatures)))
+    # Frames taken from the cache keep its name ids, parsed frames add their new names after them
+    names = list(frame_cache.names) if frame_cache is not None else []
+    name_ids = {name: name_id for name_id, name in enumerate(names)}
+    all_frames = []
+
+    for position, frame_file in enumerate(tqdm(frame_files, desc="Reading frames", leave=False)):
+        if frame_cache is not None and frame_cache.is_valid(frame_file, signatures[position]):
+            if not stale and frame_file not in selected_frames:
+                frame_states.append(frame_cache.frame_states(frame_file))
+                continue
+            packed_frame = frame_cache.packed_frame(frame_file, names)
+        else:
+            packed_frame = pack_frame(parse_frame_attributes(os.path.join(frames_path, frame_file)), names, name_ids)
+
+        frame_states.append(packed_frame.rendering_states())
+        if stale:
+            all_frames.append(packed_frame)
+        if frame_file in selected_frames:
+            parsed_frames[frame_file] = packed_frame
+
+    if stale:
+        frame_cache = None
+        write_frame_cache(cache_path, frame_files, signatures, all_frames, names)
+
+    return parsed_frames, VisibilityScores.from_frame_states(frame_states)
@@ -0,0 +1,287 @@
+import os
+import json
+import numpy as np
+
+FRAME_CACHE_VERSION = 1
+INDEX_FILE = "index.json"
+
+ACTOR_TYPES = ["Rectangular Prism", "Sphere", "Point Cloud"]
+VECTOR_FIELDS = ["Center", "Scale", "Rotation"]
+SCALAR_FIELDS = ["Radius", "Light Intensity"]
+COLOR_FIELDS = ["Material Color", "Light Color"]
+FIELD_BITS = {name: 1 << bit for bit, name in enumerate(VECTOR_FIELDS + SCALAR_FIELDS + COLOR_FIELDS + ["Rendered", "Points"])}
+
+def _column_name(field):
+    return field.lower().replace(" ", "_")
+
+def frame_signature(frame_path):
+    """
+    Returns the (size, mtime) signature used to detect a modified source frame.
+    """
+    stat = os.stat(frame_path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+class PackedFrame:
+    """
+    Parsed actors of one frame held as small column arrays, the layout of the frame cache, instead of attribute
+    dictionaries. Actor names are ids into a names list shared by the frames of a participant.
+    """
+
+    def __init__(self, columns, points, names):
+        """
+        Args:
+            columns (dict): Column arrays with one row per actor, and points_offsets with one more entry.
+            points (numpy.ndarray): (P, 3) prism corners of all actors, sliced by points_offsets.
+            names (list): Actor names indexed by the name_id column.
+        """
+        self.columns = columns
+        self.points = points
+        self.names = names
+        self.scores = None
+
+    def __len__(self):
+        return len(self.columns["name_id"])
+
+    def rendering_states(self):
+        """
+        Returns the raw rendering states of the actors of the frame, without decoding the other attributes.
+        """
+        has_rendered = (self.columns["fields"] & FIELD_BITS["Rendered"]) != 0
+        return {self.names[name_id]: int(value) for name_id, value, present
+                in zip(self.columns["name_id"], self.columns["rendered"], has_rendered) if present}
+
+    def set_scores(self, actor_rendering_dict):
+        """
+        Stores the visibility scores replacing the raw rendering states when the frame is decoded, see apply_visibility_scores.
+
+        Args:
+            actor_rendering_dict (dict or None): Actor names mapped to their visibility score for the frame.
+        """
+        if not actor_rendering_dict:
+            self.scores = None
+            return
+        # NaN stands for a missing (None) score
+        self.scores = np.array([np.nan if actor_rendering_dict[self.names[name_id]] is None else actor_rendering_dict[self.names[name_id]]
+                                for name_id in self.columns["name_id"]], dtype=np.float64)
+
+    def entity_lists(self):
+        """
+        Rebuilds the (prisms, spheres, point_clouds) attribute lists of the frame, as parse_frame_attributes returns them,
+        with the visibility scores given to set_scores.
+        """
+        columns = self.columns
+        entity_lists = ([], [], [])
+
+        for row in range(len(self)):
+            fields = int(columns["fields"][row])
+            actor_type = int(columns["actor_type"][row])
+            entity = {"Type": ACTOR_TYPES[actor_type], "Name": self.names[columns["name_id"][row]]}
+            for field in VECTOR_FIELDS:
+                if fields & FIELD_BITS[field]:
+                    entity[field] = columns[_column_name(field)][row].tolist()
+            for field in SCALAR_FIELDS:
+                if fields & FIELD_BITS[field]:
+                    entity[field] = float(columns[_column_name(field)][row])
+            for field in COLOR_FIELDS:
+                if fields & FIELD_BITS[field]:
+                    length = int(columns[_column_name(field) + "_length"][row])
+                    entity[field] = columns[_column_name(field)][row, :length].tolist()
+            if fields & FIELD_BITS["Rendered"]:
+                if self.scores is None:
+                    entity["Rendered"] = int(columns["rendered"][row])
+                else:
+                    score = float(self.scores[row])
+                    entity["Rendered"] = None if np.isnan(score) else score
+            if fields & FIELD_BITS["Points"]:
+                points = self.points[columns["points_offsets"][row]:columns["points_offsets"][row + 1]]
+                entity["Points"] = [tuple(point) for point in points.tolist()]
+            entity_lists[actor_type].append(entity)
+
+        return entity_lists
+
+def pack_frame(entity_lists, names, name_ids):
+    """
+    Packs the parsed actors of a frame into a PackedFrame.
+
+    Args:
+        entity_lists (tuple): Lists of prism, sphere and point cloud attribute dictionaries, as parse_frame_attributes returns them.
+        names (list): Actor names shared by the frames of a participant, new names are appended.
+        name_ids (dict): Actor names mapped to their position in names, kept in step with names.
+
+    Returns:
+        PackedFrame: The packed frame.
+    """
+    rows = [entity for entities in entity_lists for entity in entities]
+    num_rows = len(rows)
+
+    columns = {
+        "name_id": np.empty(num_rows, dtype=np.int32),
+        "actor_type": np.empty(num_rows, dtype=np.uint8),
+        "fields": np.zeros(num_rows, dtype=np.uint16),
+        "rendered": np.zeros(num_rows, dtype=np.uint8),
+        "points_offsets": np.zeros(num_rows + 1, dtype=np.int64),
+    }
+    for field in VECTOR_FIELDS:
+        columns[_column_name(field)] = np.zeros((num_rows, 3), dtype=np.float64)
+    for field in SCALAR_FIELDS:
+        columns[_column_name(field)] = np.zeros(num_rows, dtype=np.float64)
+    for field in COLOR_FIELDS:
+        width = max([len(entity[field]) for entity in rows if field in entity], default=0)
+        columns[_column_name(field)] = np.zeros((num_rows, width), dtype=np.int32)
+        columns[_column_name(field) + "_length"] = np.zeros(num_rows, dtype=np.uint8)
+
+    points = []
+    for row, entity in enumerate(rows):
+        if entity["Name"] not in name_ids:
+            name_ids[entity["Name"]] = len(names)
+            names.append(entity["Name"])
+        columns["name_id"][row] = name_ids[entity["Name"]]
+        columns["actor_type"][row] = ACTOR_TYPES.index(entity["Type"])
+        fields = 0
+        for field in VECTOR_FIELDS + SCALAR_FIELDS:
+            if field in entity:
+                columns[_column_name(field)][row] = entity[field]
+                fields |= FIELD_BITS[field]
+        for field in COLOR_FIELDS:
+            if field in entity:
+                values = entity[field]
+                columns[_column_name(field)][row, :len(values)] = values
+                columns[_column_name(field) + "_length"][row] = len(values)
+                fields |= FIELD_BITS[field]
+        if "Rendered" in entity:
+            columns["rendered"][row] = 1 if entity["Rendered"] == 1 else 0
+            fields |= FIELD_BITS["Rendered"]
+        if "Points" in entity:
+            points.extend(entity["Points"])
+            fields |= FIELD_BITS["Points"]
+        columns["fields"][row] = fields
+        columns["points_offsets"][row + 1] = len(points)
+
+    return PackedFrame(columns, np.array(points, dtype=np.float64).reshape(-1, 3), names)
+
+def write_frame_cache(cache_path, frame_files, signatures, frames, names):
+    """
+    Writes the parsed actors of all frames of a participant as columnar .npy files.
+
+    Args:
+        cache_path (str): Folder holding the cache of the participant.
+        frame_files (list): Frame file names, in frame order.
+        signatures (list): (size, mtime) signature of each frame file.
+        frames (list): PackedFrame of each frame.
+        names (list): Actor names shared by the packed frames.
+    """
+    os.makedirs(cache_path, exist_ok=True)
+    index_path = os.path.join(cache_path, INDEX_FILE)
+    # The index is written last, so an interrupted write leaves no valid cache behind
+    if os.path.exists(index_path):
+        os.remove(index_path)
+
+    frame_offsets = np.zeros(len(frames) + 1, dtype=np.int64)
+    frame_offsets[1:] = np.cumsum([len(frame) for frame in frames])
+    point_counts = np.cumsum([0] + [len(frame.points) for frame in frames])
+
+    # An empty frame gives the column types when there is no frame at all
+    parts = frames or [pack_frame(([], [], []), [], {})]
+    columns = {}
+    for name in ["name_id", "actor_type", "fields", "rendered"] + [_column_name(field) for field in VECTOR_FIELDS + SCALAR_FIELDS]:
+        columns[name] = np.concatenate([frame.columns[name] for frame in parts])
+    for field in COLOR_FIELDS:
+        name = _column_name(field)
+        # Frames are packed with their own colour width, the cache uses the widest one
+        width = max(frame.columns[name].shape[1] for frame in parts)
+        columns[name] = np.zeros((frame_offsets[-1], width), dtype=np.int32)
+        for frame, start in zip(frames, frame_offsets):
+            columns[name][start:start + len(frame), :frame.columns[name].shape[1]] = frame.columns[name]
+        columns[name + "_length"] = np.concatenate([frame.columns[name + "_length"] for frame in parts])
+    columns["points_offsets"] = np.concatenate([np.zeros(1, dtype=np.int64)] + [frame.columns["points_offsets"][1:] + offset
+                                                                                for frame, offset in zip(frames, point_counts)])
+    columns["frame_offsets"] = frame_offsets
+    columns["points"] = np.concatenate([frame.points for frame in parts])
+
+    # Replace the files rather than overwriting them, an open FrameCache may still map the previous ones
+    for name, column in columns.items():
+        column_path = os.path.join(cache_path, f"{name}.npy")
+        with open(column_path + ".tmp", 'wb') as file:
+            np.save(file, column)
+        os.replace(column_path + ".tmp", column_path)
+
+    with open(index_path, 'w') as file:
+        json.dump({"version": FRAME_CACHE_VERSION,
+                   "frames": [[frame_file] + list(signature) for frame_file, signature in zip(frame_files, signatures)],
+                   "names": list(names)}, file)
+
+class FrameCache:
+    """
+    Memory-mapped view of the parsed frames of one participant written by write_frame_cache.
+    """
+
+    def __init__(self, cache_path):
+        with open(os.path.join(cache_path, INDEX_FILE), 'r') as file:
+            index = json.load(file)
+        if index.get("version") != FRAME_CACHE_VERSION:
+            raise ValueError(f"Unsupported frame cache version {index.get('version')}.")
+
+        self.names = index["names"]
+        self.frames = {frame_file: (position, [size, mtime]) for position, (frame_file, size, mtime) in enumerate(index["frames"])}
+        self.columns = {}
+        for file_name in os.listdir(cache_path):
+            if file_name.endswith(".npy"):
+                self.columns[file_name[:-4]] = np.load(os.path.join(cache_path, file_name), mmap_mode='r')
+
+    def is_valid(self, frame_file, signature):
+        """
+        Returns True if the frame is cached and its source file has not changed since.
+        """
+        return frame_file in self.frames and self.frames[frame_file][1] == list(signature)
+
+    def _rows(self, frame_file):
+        position = self.frames[frame_file][0]
+        offsets = self.columns["frame_offsets"]
+        return int(offsets[position]), int(offsets[position + 1])
+
+    def frame_states(self, frame_file):
+        """
+        Returns the raw rendering states of the actors of a frame, without decoding the other attributes.
+        """
+        start, end = self._rows(frame_file)
+        name_ids = self.columns["name_id"][start:end]
+        has_rendered = (self.columns["fields"][start:end] & FIELD_BITS["Rendered"]) != 0
+        rendered = self.columns["rendered"][start:end]
+        return {self.names[name_id]: int(value) for name_id, value, present in zip(name_ids, rendered, has_rendered) if present}
+
+    def packed_frame(self, frame_file, names=None):
+        """
+        Copies the rows of a frame out of the cache as a PackedFrame.
+
+        Args:
+            frame_file (str): Name of the frame file.
+            names (list, optional): Names list the frame refers to, it must start with the names of the cache. Default is None
+                (the names of the cache).
+        """
+        start, end = self._rows(frame_file)
+        columns = {name: np.array(column[start:end + (1 if name == "points_offsets" else 0)]) for name, column in self.columns.items()
+                   if name not in ("frame_offsets", "points")}
+        point_start = columns["points_offsets"][0]
+        points = np.array(self.columns["points"][point_start:columns["points_offsets"][-1]])
+        columns["points_offsets"] -= point_start
+        return PackedFrame(columns, points, self.names if names is None else names)
+
+    def frame_entities(self, frame_file):
+        """
+        Rebuilds the (prisms, spheres, point_clouds) attribute lists of a frame, as parse_frame_attributes returns them.
+        """
+        return self.packed_frame(frame_file).entity_lists()
+
+def load_frame_cache(cache_path):
+    """
+    Opens the frame cache of a participant.
+
+    Returns:
+        FrameCache or None: The cache, or None if it does not exist or cannot be read.
+    """
+    if not os.path.exists(os.path.join(cache_path, INDEX_FILE)):
+        return None
+    try:
+        return FrameCache(cache_path)
+    except (OSError, ValueError, KeyError):
+        return None
@@ -0,0 +1,167 @@
+import os
+import re
+import time
+import numpy as np
+from ply_reader import read_static_pcds, read_ply_header, quantization_from_comments
+from delta_frames import load_frame_blocks, split_actor_blocks, KEYFRAME_EXTENSION, DELTA_EXTENSION
+from frame_container import FramePack, PACK_FILE
+
+FRAME_FILE_PATTERN = re.compile(rf"frame_(\d+)({re.escape(KEYFRAME_EXTENSION)}|{re.escape(DELTA_EXTENSION)})")
+
+def _same_quantization(first, second):
+    if first is None or second is None:
+        return first is second
+    return first[0] == second[0] and np.array_equal(first[1], second[1])
+
+class FrameComposer:
+    """
+    Streams full-scene frames of a converted participant: the StaticPCDs of the experiment are read once and
+    every dynamic frame is appended to them in a reused buffer, so the concatenated dataset is never written out.
+
+    Dynamic frames are read from frame_N.ply files, from keyframes and deltas of a delta-encoded conversion,
+    or from the frames.pack container of a packed conversion.
+    """
+
+    def __init__(self, output_path, experiment, participant, actors=None, include_static=True):
+        """
+        Args:
+            output_path (str): Root output folder of the conversion.
+            experiment (str): Name of the experiment.
+            participant (str): Name of the participant.
+            actors (iterable, optional): Names of the actors to keep, static and dynamic. Default is None (all actors).
+            include_static (bool, optional): Whether to add the static elements to every frame. Default is True.
+        """
+        self.dynamic_folder = os.path.join(output_path, experiment, participant, "DynamicActors")
+        pack_path = os.path.join(self.dynamic_folder, PACK_FILE)
+        self.pack = FramePack(pack_path) if os.path.exists(pack_path) else None
+        if self.pack is None and not os.path.isdir(self.dynamic_folder):
+            raise FileNotFoundError(f"No converted frames in '{self.dynamic_folder}'.")
+        self.actors = set(actors) if actors is not None else None
+        self.frames_composed = 0
+        self.points_composed = 0
+        self.elapsed = 0.0
+
+        static_pcds = {}
+        if include_static:
+            static_pcds = read_static_pcds(os.path.join(output_path, experiment, "StaticPCDs"))
+        static_names = [name for name in static_pcds if self._selected(name)]
+        self.static_points = np.concatenate([static_pcds[name] for name in static_names]) if static_names else None
+
+        # Quantized coordinates can only be stitched together when every file uses the same scale and offset
+        static_quantizations = [quantization_from_comments(read_ply_header(os.path.join(output_path, experiment, "StaticPCDs", f"{name}.ply"))[3])
+                                for name in static_names]
+        self.static_quantization = static_quantizations[0] if static_quantizations else None
+        if any(not _same_quantization(quantization, self.static_quantization) for quantization in static_quantizations):
+            raise ValueError("The StaticPCDs were quantized with different offsets and cannot be composed.")
+        self._buffer = None
+
+    def _selected(self, actor_name):
+        return self.actors is None or actor_name in self.actors
+
+    def frame_numbers(self, start=None, end=None):
+        """
+        Lists the converted frames of the participant, sorted by frame number.
+
+        Args:
+            start (int, optional): First frame number to include. Default is None (no lower bound).
+            end (int, optional): Last frame number to include. Default is None (no upper bound).
+
+        Returns:
+            list: Frame numbers found in the DynamicActors folder or its frame container.
+        """
+        frame_numbers = set()
+        if self.pack is not None:
+            frame_numbers = {int(frame_name.split('_')[1]) for frame_name in self.pack.frame_names()}
+        else:
+            for file_name in os.listdir(self.dynamic_folder):
+                match = FRAME_FILE_PATTERN.fullmatch(file_name)
+                if match:
+                    frame_numbers.add(int(match.group(1)))
+        return [number for number in sorted(frame_numbers)
+                if (start is None or number >= start) and (end is None or number <= end)]
+
+    def _frame_blocks(self, frame_number):
+        """
+        Reads the dynamic points of a frame as per-actor blocks, see load_frame_blocks.
+        """
+        if self.pack is None:
+            return load_frame_blocks(self.dynamic_folder, frame_number)
+        frame_name = f"frame_{frame_number}"
+        if frame_name not in self.pack.frames:
+            raise FileNotFoundError(f"Frame {frame_number} not found in '{self.pack.file_path}'.")
+        points = self.pack.read_frame(frame_name)
+        comments = self.pack.frame_comments(frame_name)
+        entries = split_actor_blocks(points, comments)
+        if not entries:
+            return [(None, points)], points.dtype, comments
+        return [(name, block) for _, name, block in entries], points.dtype, comments
+
+    def _frame_buffer(self, point_dtype, num_dynamic_points):
+        """
+        Returns the reused frame buffer, holding the static points followed by room for the dynamic ones.
+        The buffer is only reallocated when a frame needs more room.
+        """
+        num_static_points = 0 if self.static_points is None else len(self.static_points)
+        if self.static_points is not None and self.static_points.dtype != point_dtype:
+            raise ValueError("StaticPCDs and DynamicActors were written with different point layouts.")
+
+        size = num_static_points + num_dynamic_points
+        if self._buffer is None or self._buffer.dtype != point_dtype or len(self._buffer) < size:
+            self._buffer = np.empty(max(size, int(1.25 * size)), dtype=point_dtype)
+            if num_static_points:
+                self._buffer[:num_static_points] = self.static_points
+        return self._buffer, num_static_points
+
+    def compose(self, frame_number):
+        """
+        Builds one full-scene frame.
+
+        The returned array is a view of the reused buffer and is overwritten by the next call; copy it to keep it.
+
+        Args:
+            frame_number (int): Number of the frame to compose.
+
+        Returns:
+            numpy.ndarray: Structured array with the static points followed by the selected dynamic actors.
+        """
+        start_time = time.perf_counter()
+        blocks, point_dtype, comments = self._frame_blocks(frame_number)
+        if self.static_points is not None and not _same_quantization(quantization_from_comments(comments), self.static_quantization):
+            raise ValueError(f"Frame {frame_number} and the StaticPCDs were quantized with different offsets, "
+                             "convert with Experiment quantization bounds to compose them.")
+        if self.actors is not None:
+            if any(name is None for name, _ in blocks):
+                raise ValueError(f"Frame {frame_number} has no per-actor point counts and cannot be filtered by actor.")
+            blocks = [(name, block) for name, block in blocks if self._selected(name)]
+
+        buffer, offset = self._frame_buffer(point_dtype, sum(len(block) for _, block in blocks))
+        for _, block in blocks:
+            buffer[offset:offset + len(block)] = block
+            offset += len(block)
+
+        self.frames_composed += 1
+        self.points_composed += offset
+        self.elapsed += time.perf_counter() - start_time
+        return buffer[:offset]
+
+    def frames(self, start=None, end=None):
+        """
+        Yields the full-scene frames of a frame range.
+
+        Args:
+            start (int, optional): First frame number to compose. Default is None (first converted frame).
+            end (int, optional): Last frame number to compose. Default is None (last converted frame).
+
+        Yields:
+            tuple: (frame number, structured array of the frame). The array is only valid until the next frame is yielded.
+        """
+        for frame_number in self.frame_numbers(start, end):
+            yield frame_number, self.compose(frame_number)
+
+    def summary(self):
+        """
+        Returns a one-line human readable summary of the composition throughput.
+        """
+        frames_per_second = self.frames_composed / self.elapsed if self.elapsed else 0.0
+        return (f"Composed {self.frames_composed} frames ({self.points_composed} points) "
+                f"at {frames_per_second:.1f} frames/sec.")
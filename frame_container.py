@@ -0,0 +1,221 @@
+import os
+import sys
+import json
+import struct
+import argparse
+import numpy as np
+from ply_reader import dtype_from_properties
+
+PACK_FILE = "frames.pack"
+PACK_MAGIC = b"MAZEPACK"
+PACK_VERSION = 1
+# Header: magic and format version. Footer: offset and length of the JSON index, then the magic again
+HEADER_FORMAT = "<8sQ"
+FOOTER_FORMAT = "<QQ8s"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+FOOTER_SIZE = struct.calcsize(FOOTER_FORMAT)
+
+def _frame_sort_key(frame_name):
+    digits = ''.join(character for character in frame_name if character.isdigit())
+    return (int(digits) if digits else -1, frame_name)
+
+def read_pack_index(file_path, end=None):
+    """
+    Reads the index stored at the end of a frame container.
+
+    Args:
+        file_path (str): Path to the container file.
+        end (int, optional): Byte offset where the footer of the index ends. Default is None (end of the file).
+
+    Returns:
+        tuple: (index dict, byte offset where the index starts, i.e. the end of the frame data)
+    """
+    with open(file_path, 'rb') as file:
+        magic, version = struct.unpack(HEADER_FORMAT, file.read(HEADER_SIZE))
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"'{file_path}' is not a version {PACK_VERSION} frame container.")
+        if end is None:
+            file.seek(-FOOTER_SIZE, os.SEEK_END)
+        else:
+            file.seek(end - FOOTER_SIZE)
+        index_offset, index_length, magic = struct.unpack(FOOTER_FORMAT, file.read(FOOTER_SIZE))
+        if magic != PACK_MAGIC or (end is not None and index_offset + index_length + FOOTER_SIZE != end):
+            raise ValueError(f"'{file_path}' has no index, it was not closed properly.")
+        file.seek(index_offset)
+        index = json.loads(file.read(index_length).decode('utf-8'))
+    return index, index_offset
+
+class FramePackWriter:
+    """
+    Appends the converted frames of one participant to a single container file.
+
+    The file holds the binary PLY records of every frame, followed by a JSON index giving the offset, point count
+    and header comments of each frame and the PLY properties shared by all frames.
+    flush() writes the index after the frame data. Frames appended afterwards go after that index, which stays valid
+    until the next flush, so a container left by an interrupted process can be cut back to its last flushed index and
+    extended (see index_end). Each flush leaves the previous index behind as unused bytes.
+    """
+
+    def __init__(self, file_path, properties, resume_end=None):
+        """
+        Args:
+            file_path (str): Path to the container file.
+            properties (str): PLY property lines of the point layout, as returned by get_ply_properties.
+            resume_end (int, optional): index_end of an earlier writer of the container. Its frames are kept if the index
+                flushed there is intact and has the same layout, and the bytes written after it are dropped.
+                Default is None (start a new container).
+        """
+        self.file_path = file_path
+        self.properties = properties
+        self.frames = {}
+        self.data_end = HEADER_SIZE
+        self.index_end = None
+
+        if resume_end is not None and os.path.exists(file_path):
+            try:
+                index, _ = read_pack_index(file_path, resume_end)
+                if index.get("properties") == properties:
+                    self.frames = index["frames"]
+                    self.data_end = self.index_end = resume_end
+            except (OSError, ValueError, struct.error):
+                pass
+
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        self.file = open(file_path, 'r+b' if self.index_end else 'w+b')
+        if self.index_end:
+            # Frames appended after the last flush have no index entry
+            self.file.truncate(self.index_end)
+        else:
+            self.file.write(struct.pack(HEADER_FORMAT, PACK_MAGIC, PACK_VERSION))
+
+    def frame_names(self):
+        return list(self.frames)
+
+    def append(self, frame_name, records, comments=None):
+        """
+        Appends the structured records of a frame. A frame already in the container is replaced.
+
+        Args:
+            frame_name (str): Name of the frame, e.g. 'frame_12'.
+            records (numpy.ndarray): Structured array of the points, with the container's point layout.
+            comments (list, optional): PLY header comments of the frame. Default is None.
+        """
+        data = np.ascontiguousarray(records).tobytes()
+        self.file.seek(self.data_end)
+        self.file.write(data)
+        self.frames[frame_name] = {"offset": self.data_end, "count": len(records), "comments": list(comments or [])}
+        self.data_end += len(data)
+
+    def remove(self, frame_name):
+        if self.frames.pop(frame_name, None) is not None:
+            self.index_end = None
+
+    def flush(self):
+        """
+        Writes the index after the frame data, making every appended frame readable. The container can then be
+        resumed from index_end.
+        """
+        if self.index_end is not None and self.data_end == self.index_end:
+            return
+        frames = dict(sorted(self.frames.items(), key=lambda item: _frame_sort_key(item[0])))
+        index = json.dumps({"properties": self.properties, "frames": frames}).encode('utf-8')
+        self.file.seek(self.data_end)
+        self.file.write(index)
+        self.file.write(struct.pack(FOOTER_FORMAT, self.data_end, len(index), PACK_MAGIC))
+        self.file.truncate()
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.data_end = self.index_end = self.file.tell()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+class FramePack:
+    """
+    Read access to a frame container: any frame is returned as a memory-mapped structured array with one seek.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        index, _ = read_pack_index(file_path)
+        self.properties = index["properties"]
+        self.frames = index["frames"]
+        self.point_dtype = dtype_from_properties(self.properties.splitlines())
+
+    def __len__(self):
+        return len(self.frames)
+
+    def frame_names(self):
+        """
+        Returns the names of the frames in the container, sorted by frame number.
+        """
+        return sorted(self.frames, key=_frame_sort_key)
+
+    def point_count(self, frame_name):
+        return self.frames[frame_name]["count"]
+
+    def frame_comments(self, frame_name):
+        return self.frames[frame_name]["comments"]
+
+    def read_frame(self, frame_name):
+        """
+        Returns the points of a frame.
+
+        Args:
+            frame_name (str): Name of the frame, e.g. 'frame_12'.
+
+        Returns:
+            numpy.ndarray: Read-only memory-mapped structured array with the records of frame_name.ply.
+        """
+        entry = self.frames[frame_name]
+        if entry["count"] == 0:
+            return np.empty(0, dtype=self.point_dtype)
+        return np.memmap(self.file_path, dtype=self.point_dtype, mode='r', offset=entry["offset"], shape=(entry["count"],))
+
+    def export_ply(self, frame_name, file_path):
+        """
+        Writes one frame as a binary PLY file, identical to the one a non-packed conversion writes.
+        """
+        header = "ply\nformat binary_little_endian 1.0\n"
+        for comment in self.frame_comments(frame_name):
+            header += f"comment {comment}\n"
+        header += f"element vertex {self.point_count(frame_name)}\n"
+        header += self.properties
+        header += "end_header\n"
+        with open(file_path, 'wb') as file:
+            file.write(header.encode('utf-8'))
+            file.write(np.ascontiguousarray(self.read_frame(frame_name)).tobytes())
+
+def export_pack(pack_path, output_folder, frame_names=None):
+    """
+    Exports the frames of a container to individual frame_N.ply files.
+
+    Args:
+        pack_path (str): Path to the container file.
+        output_folder (str): Folder receiving the PLY files.
+        frame_names (list, optional): Frames to export. Default is None (all frames).
+
+    Returns:
+        int: Number of exported frames.
+    """
+    pack = FramePack(pack_path)
+    os.makedirs(output_folder, exist_ok=True)
+    frame_names = pack.frame_names() if frame_names is None else frame_names
+    for frame_name in frame_names:
+        pack.export_ply(frame_name, os.path.join(output_folder, f"{frame_name}.ply"))
+    return len(frame_names)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Export the frames of a packed DynamicActors container to PLY files.')
+    parser.add_argument('pack_path', type=str, help=f'Path to a {PACK_FILE} container')
+    parser.add_argument('output_folder', type=str, help='Folder receiving the frame_N.ply files')
+    parser.add_argument('--frames', type=str, nargs='*', default=None, help='Names of the frames to export (default: all)')
+    args = parser.parse_args()
+
+    try:
+        count = export_pack(args.pack_path, args.output_folder, args.frames)
+        print(f"Exported {count} frames to '{args.output_folder}'.")
+    except Exception as e:
+        print(f"Error exporting '{args.pack_path}': {e}", file=sys.stderr)
+        sys.exit(1)
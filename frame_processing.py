@@ -3,81 +3,229 @@ import os
 import sys
 from file_operations import read_attributes_from_file, load_point_cloud
 from sphere_converter import generate_sphere_points
-from rect_prism_converter import generate_prism_faces
-from pcd_converter import apply_transformations
+from rect_prism_converter import generate_prism_faces, generate_prism_faces_batch, order_points_3d, order_points_rect_batch, PRISM_FACES
+from pcd_converter import subsample_points, apply_transformations_batch
 
-def process_points(points, material_color, light_color, light_intensity, config, rendered, all_points, actor_name=None, all_points_by_actor=None):
+LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114])
+
+def _attribute_columns(values, num_points):
     """
-    Processes a set of points, applying color and light transformations based on the specified material and light color modes.
-    Optionally, organizes points by actor if actor_name and all_points_by_actor are provided.
+    Broadcasts an entity-level attribute (one value or vector per actor) or a per-point attribute
+    to a (num_points, K) float64 column block.
+    """
+    if isinstance(values, np.ndarray) and len(values) == num_points:
+        return np.asarray(values, dtype=np.float64).reshape(num_points, -1)
+    values = np.asarray(values, dtype=np.float64).reshape(1, -1)
+    return np.broadcast_to(values, (num_points, values.shape[1]))
 
-    Args:
-        points (np.ndarray or list): List or array of points to process.
-        material_color (np.ndarray or list): Color values for the points.
-        light_color (np.ndarray or list): Light color values for the points.
-        light_intensity (np.ndarray or list): Light intensity values for the points.
-        config (Config): Configuration object containing parameters for processing.
-        rendered (str): Whether the points should be rendered ('yes' or 'no').
-        all_points (list): List to store processed points.
-        actor_name (str, optional): Name of the actor for organizing points. Default is None.
-        all_points_by_actor (dict, optional): Dictionary to store points organized by actor. Default is None.
+def _luma(colors):
     """
-    transformed_points = [] 
+    Converts RGB(A) columns to a single grey scale (luma) column.
+    """
+    return colors[:, 0:1] * LUMA_WEIGHTS[0] + colors[:, 1:2] * LUMA_WEIGHTS[1] + colors[:, 2:3] * LUMA_WEIGHTS[2]
 
-    # Assertions to validate inputs
-    assert hasattr(config, 'material_color'), "Config must have 'material_color' attribute."
-    assert hasattr(config, 'light_color'), "Config must have 'light_color' attribute."
-    assert hasattr(config, 'float_precision'), "Config must have 'float_precision' attribute."
+def build_attribute_block(points, material_color, light_color, light_intensity, rendered, config):
+    """
+    Builds the final column block for a batch of points in a few array operations.
+    Column order matches the PLY layout written by save_ply: coordinates, material color, light color, rendered.
 
-    is_color_list = isinstance(material_color, np.ndarray) and len(material_color) == len(points)
-    is_light_list = isinstance(light_color, np.ndarray) and len(light_color) == len(points)
-    is_intensity_list = isinstance(light_intensity, np.ndarray) and len(light_intensity) == len(points)
+    Args:
+        points (np.ndarray): (N, 3) array of coordinates.
+        material_color (np.ndarray or list): Color of the entity, or (N, 4) per-point colors.
+        light_color (np.ndarray or list): Light color of the entity, or (N, 4) per-point light colors.
+        light_intensity (float or np.ndarray): Light intensity of the entity, or (N,) per-point intensities.
+        rendered (float or np.ndarray): Rendering flag or visibility score, or (N,) per-point values.
+        config (Config): Configuration object containing the material and light color modes.
 
-    for i, point in enumerate(points):
-        point = np.append(point, []) if isinstance(point, np.ndarray) else point[:]
-        point_color = material_color[i] if is_color_list else material_color
-        point_light = light_color[i] if is_light_list else light_color
-        point_intensity = light_intensity[i] if is_intensity_list else light_intensity
+    Returns:
+        np.ndarray: (N, K) float64 array with all point attributes.
+    """
+    num_points = len(points)
+    columns = [np.asarray(points, dtype=np.float64).reshape(num_points, -1)]
 
-        # Process material color
+    # Process material color
+    if config.material_color != "None":
+        colors = _attribute_columns(material_color, num_points)
         if config.material_color == "RGBA":
-            point = np.append(point, point_color)
+            columns.append(colors)
         elif config.material_color == "Grey Scale":
-            Y = 0.299 * point_color[0] + 0.587 * point_color[1] + 0.114 * point_color[2]
-            point = np.append(point, Y)
+            columns.append(_luma(colors))
         elif config.material_color == "RGB":
-            point = np.append(point, point_color[:3])
+            columns.append(colors[:, :3])
         else:
             raise ValueError("Invalid material color mode.")
 
-        # Process light color
+    # Process light color
+    if config.light_color != "None":
+        lights = _attribute_columns(light_color, num_points)
+        intensity = _attribute_columns(light_intensity, num_points)
         if config.light_color == "RGBAI":
-            point = np.append(point, np.append(point_light, point_intensity))
+            columns.extend([lights, intensity])
         elif config.light_color == "RGBA":
-            point = np.append(point, point_light)
+            columns.append(lights)
         elif config.light_color == "RGBI":
-            point = np.append(point, np.append(point_light[:3], point_intensity))
+            columns.extend([lights[:, :3], intensity])
         elif config.light_color == "Grey Scale":
-            Y = 0.299 * point_light[0] + 0.587 * point_light[1] + 0.114 * point_light[2]
-            point = np.append(point, Y)
+            columns.append(_luma(lights))
         elif config.light_color == "RGB":
-            point = np.append(point, point_light[:3])
+            columns.append(lights[:, :3])
+        elif config.light_color == "Intensity":
+            columns.append(intensity)
         else:
             raise ValueError("Invalid light color mode.")
 
-        point = np.append(point, rendered)
+    columns.append(_attribute_columns(rendered, num_points))
 
-        transformed_points.append(point)
+    return np.hstack(columns)
+
+def voxel_downsample(block, voxel_size, representative="Mean"):
+    """
+    Downsamples a point block to one point per occupied cell of a regular voxel grid.
+
+    Points are assigned to cells by sorting their integer cell keys, so the cost is one sort and a few linear passes.
+    Cells are returned in key order, which makes the result independent of the order of the input points.
+
+    Args:
+        block (np.ndarray): (N, K) point block, with x, y, z in the first three columns.
+        voxel_size (float): Edge length of the voxels, in scene units.
+        representative (str, optional): 'Mean' averages every column of the points of a cell, 'Nearest' keeps the
+            point closest to the cell center. Default is 'Mean'.
+
+    Returns:
+        np.ndarray: (M, K) downsampled block, M being the number of occupied voxels.
+    """
+    if len(block) == 0:
+        return block
+    cells = np.floor(block[:, :3] / voxel_size).astype(np.int64)
+    cells -= cells.min(axis=0)
+    dims = cells.max(axis=0) + 1
+    if np.prod(dims.astype(np.float64)) < 2**62:
+        keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    else:
+        # Grids too large for a single int64 key are sorted on the three cell coordinates
+        keys = np.unique(cells, axis=0, return_inverse=True)[1].ravel()
+
+    if representative == "Nearest":
+        centers = (np.floor(block[:, :3] / voxel_size) + 0.5) * voxel_size
+        distances = np.sum((block[:, :3] - centers) ** 2, axis=1)
+        order = np.lexsort((distances, keys))
+    else:
+        order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+
+    if representative == "Nearest":
+        return block[order[starts]]
+    counts = np.diff(np.r_[starts, len(block)])
+    sums = np.add.reduceat(np.asarray(block, dtype=np.float64)[order], starts, axis=0)
+    return sums / counts[:, np.newaxis]
+
+def stack_point_blocks(blocks):
+    """
+    Concatenates processed point blocks into a single float32 array.
+
+    Args:
+        blocks (list): List of (N, K) point blocks.
+
+    Returns:
+        np.ndarray: Concatenated points, or an empty array if there are none.
+    """
+    if not blocks:
+        return np.array([], dtype=np.float32)
+    return np.concatenate(blocks).astype(np.float32)
+
+def process_points(points, material_color, light_color, light_intensity, config, rendered, all_points, actor_name=None, all_points_by_actor=None):
+    """
+    Processes a set of points, applying color and light transformations based on the specified material and light color modes.
+    Optionally, organizes points by actor if actor_name and all_points_by_actor are provided.
+
+    Args:
+        points (np.ndarray or list): List or array of points to process.
+        material_color (np.ndarray or list): Color values for the points.
+        light_color (np.ndarray or list): Light color values for the points.
+        light_intensity (np.ndarray or list): Light intensity values for the points.
+        config (Config): Configuration object containing parameters for processing.
+        rendered (str): Whether the points should be rendered ('yes' or 'no').
+        all_points (list): List to store processed point blocks.
+        actor_name (str, optional): Name of the actor for organizing points. Default is None.
+        all_points_by_actor (dict, optional): Dictionary to store point blocks organized by actor. Default is None.
+
+    Returns:
+        np.ndarray: The processed point block.
+    """
+    # Assertions to validate inputs
+    assert hasattr(config, 'material_color'), "Config must have 'material_color' attribute."
+    assert hasattr(config, 'light_color'), "Config must have 'light_color' attribute."
+    assert hasattr(config, 'float_precision'), "Config must have 'float_precision' attribute."
+
+    block = build_attribute_block(points, material_color, light_color, light_intensity, rendered, config)
+    if getattr(config, 'downsample', "Random") == "Voxel":
+        block = voxel_downsample(block, config.voxel_size, config.voxel_representative)
 
     if actor_name is not None and all_points_by_actor is not None:
         if actor_name not in all_points_by_actor:
             all_points_by_actor[actor_name] = []
-        all_points_by_actor[actor_name].extend(transformed_points)
+        all_points_by_actor[actor_name].append(block)
     else:
-        all_points.extend(transformed_points)
+        all_points.append(block)
+    return block
 
+class ActorBlockCache:
+    """
+    Remembers the last processed point block of each dynamic actor, so an actor whose attributes did not change
+    since the previous frame reuses its block and only gets its rendered column refreshed.
+    """
 
-def process_entities(entities, entity_type, config, all_points, actor_processing=False, all_points_by_actor=None):
+    def __init__(self):
+        self.reused = 0
+        self.generated = 0
+        self._blocks = {}
+
+    def __getstate__(self):
+        # Worker processes start without blocks, they only see their own sequence of frames
+        state = self.__dict__.copy()
+        state.update(reused=0, generated=0, _blocks={})
+        return state
+
+    @staticmethod
+    def signature(entity, *extra):
+        """
+        Returns a hashable signature of every actor attribute except its rendered state.
+        """
+        def freeze(value):
+            if isinstance(value, (list, tuple)):
+                return tuple(freeze(item) for item in value)
+            return value
+        return tuple((key, freeze(value)) for key, value in sorted(entity.items()) if key not in ("Rendered", "Directory")) + extra
+
+    def get(self, actor_name, signature, rendered):
+        """
+        Returns a copy of the cached block of an actor with the given rendered value, or None if the actor changed.
+        """
+        cached = self._blocks.get(actor_name)
+        if cached is None or cached[0] != signature:
+            self.generated += 1
+            return None
+        self.reused += 1
+        block = cached[1].copy()
+        block[:, -1:] = _attribute_columns(rendered, len(block))
+        return block
+
+    def put(self, actor_name, signature, block):
+        self._blocks[actor_name] = (signature, block)
+
+    def reset(self):
+        self.reused = 0
+        self.generated = 0
+        self._blocks.clear()
+
+    def summary(self):
+        total = self.reused + self.generated
+        ratio = 100.0 * self.reused / total if total else 0.0
+        return f"Temporal reuse: {self.reused}/{total} actor blocks reused ({ratio:.1f}%)."
+
+
+def process_entities(entities, entity_type, config, all_points, actor_processing=False, all_points_by_actor=None, block_cache=None):
     """
     Processes entities (spheres, prisms, or point clouds) by generating their points and applying the necessary transformations.
 
@@ -88,36 +236,211 @@ def process_entities(entities, entity_type, config, all_points, actor_processing
         all_points (list): List to store processed points.
         actor_processing (bool, optional): Flag to indicate if points should be organized by actor. Default is False.
         all_points_by_actor (dict, optional): Dictionary to store points organized by actor. Default is None.
+        block_cache (ActorBlockCache, optional): Cache of the blocks generated for the previous frame. Default is None.
+
+    Returns:
+        list: (entity type, entity, block) of every block added to all_points or all_points_by_actor, in order.
     """
+    emitted = []
+    points_per_pcd = None
     if entity_type == "point_cloud":
         nb_pcds = len(entities)
         if nb_pcds > 0:
             point_budget_pcds = int(config.pcds_point_cap)
             points_per_pcd = int(point_budget_pcds / nb_pcds)
 
-    for entity in entities:
+    cached_blocks = [None] * len(entities)
+    signatures = [None] * len(entities)
+    if block_cache is not None:
+        for index, entity in enumerate(entities):
+            signatures[index] = block_cache.signature(entity, entity_type, points_per_pcd)
+            cached_blocks[index] = block_cache.get(entity["Name"], signatures[index], entity["Rendered"])
+
+    prism_points = {}
+    if entity_type == 'prism':
+        # The faces of every prism that is not reused are generated together in one vectorized pass
+        pending = [index for index, entity in enumerate(entities)
+                   if cached_blocks[index] is None and np.shape(entity["Points"]) == (8, 3)]
+        if pending:
+            batch_points, offsets = generate_prism_faces_batch([entities[index]["Points"] for index in pending], config.prism_density,
+                                                               getattr(config, 'prism_template_cache', None))
+            for position, index in enumerate(pending):
+                prism_points[index] = batch_points[offsets[position]:offsets[position + 1]]
+
+    cloud_points = {}
+    if entity_type == 'point_cloud':
+        # Every point cloud that is not reused is subsampled, then all of them are transformed together
+        pending = []
+        for index, entity in enumerate(entities):
+            cloud_file_path = os.path.join(entity["Directory"], f'{entity["Name"]}.txt')
+            if cached_blocks[index] is None and os.path.exists(cloud_file_path):
+                if getattr(config, 'asset_cache', None) is not None:
+                    # Cached arrays are shared and read-only, subsample_points and the transformations do not modify them
+                    points = config.asset_cache.get(cloud_file_path)
+                else:
+                    points = load_point_cloud(cloud_file_path)
+                # In voxel mode the whole asset is kept and downsampled by the voxel grid instead
+                cloud_points[index] = points if getattr(config, 'downsample', "Random") == "Voxel" else subsample_points(points, points_per_pcd)
+                pending.append(index)
+        transformed = apply_transformations_batch([cloud_points[index] for index in pending],
+                                                  [entities[index]['Center'] for index in pending],
+                                                  [entities[index]['Scale'] for index in pending],
+                                                  [entities[index]['Rotation'] for index in pending])
+        cloud_points = dict(zip(pending, transformed))
+
+    for index, entity in enumerate(entities):
         rendered = entity["Rendered"]
         actor_name = entity["Name"] if actor_processing else None
+        signature = signatures[index]
+
+        if block_cache is not None:
+            block = cached_blocks[index]
+            if block is not None:
+                if actor_name is not None and all_points_by_actor is not None:
+                    all_points_by_actor.setdefault(actor_name, []).append(block)
+                else:
+                    all_points.append(block)
+                emitted.append((entity_type, entity, block))
+                continue
+
+        block = None
         if entity_type == 'sphere':
             points = generate_sphere_points(entity["Center"], entity["Radius"], config.sphere_density, True)
-            process_points(points, entity["Material Color"], entity["Light Color"], entity["Light Intensity"], config, rendered, all_points, actor_name, all_points_by_actor)
+            block = process_points(points, entity["Material Color"], entity["Light Color"], entity["Light Intensity"], config, rendered, all_points, actor_name, all_points_by_actor)
         elif entity_type == 'prism':
-            points = generate_prism_faces(entity["Points"], config.prism_density)
-            process_points(points, entity["Material Color"], entity["Light Color"], entity["Light Intensity"], config, rendered, all_points, actor_name, all_points_by_actor)
+            points = prism_points[index] if index in prism_points else generate_prism_faces(entity["Points"], config.prism_density)
+            block = process_points(points, entity["Material Color"], entity["Light Color"], entity["Light Intensity"], config, rendered, all_points, actor_name, all_points_by_actor)
         elif entity_type == 'point_cloud':
             cloud_file_path = os.path.join(entity["Directory"], f'{entity["Name"]}.txt')
-            if os.path.exists(cloud_file_path):
-                cloud_points = load_point_cloud(cloud_file_path)
-                if len(cloud_points) > points_per_pcd:
-                    np.random.seed(42)
-                    np.random.shuffle(cloud_points)
-                    cloud_points = cloud_points[:points_per_pcd]
-                points = apply_transformations(cloud_points, entity['Center'], entity['Scale'], entity['Rotation'], config.pcds_point_cap / len(entities))
-                process_points(points[:, :3], points[:, 3:7], entity["Light Color"], entity["Light Intensity"],  config, rendered, all_points, actor_name, all_points_by_actor)
+            if index in cloud_points:
+                points = cloud_points[index]
+                block = process_points(points[:, :3], points[:, 3:7], entity["Light Color"], entity["Light Intensity"],  config, rendered, all_points, actor_name, all_points_by_actor)
             else:
                 print(f"Warning: Point cloud file {cloud_file_path} not found.")
                 continue
 
+        if block is not None:
+            emitted.append((entity_type, entity, block))
+        if block_cache is not None and block is not None:
+            block_cache.put(entity["Name"], signature, block)
+
+    return emitted
+
+BUDGET_ENTITY_TYPES = ("sphere", "prism", "point_cloud")
+
+def entity_surface_area(entity_type, entity, block):
+    """
+    Surface area of an entity, used to share the frame point budget.
+
+    Spheres and prisms use their exact area. The area of a point cloud is unknown and is approximated by the
+    surface of the bounding box of its transformed points.
+
+    Args:
+        entity_type (str): Type of the entity ('sphere', 'prism', 'point_cloud').
+        entity (dict): Attributes of the entity.
+        block (np.ndarray): Processed (N, K) points of the entity.
+
+    Returns:
+        float: Surface area in squared scene units.
+    """
+    if entity_type == 'sphere':
+        return 4 * np.pi * float(entity["Radius"]) ** 2
+    if entity_type == 'prism' and np.shape(entity["Points"]) == (8, 3):
+        faces = order_points_rect_batch(order_points_3d(entity["Points"])[PRISM_FACES])
+        # Each face is a rectangle spanned by the two edges leaving its first corner
+        return float(np.linalg.norm(np.cross(faces[:, 1] - faces[:, 0], faces[:, 3] - faces[:, 0]), axis=1).sum())
+    if len(block) == 0:
+        return 0.0
+    extent = np.ptp(block[:, :3], axis=0)
+    return float(2 * (extent[0] * extent[1] + extent[1] * extent[2] + extent[0] * extent[2]))
+
+def allocate_point_budget(weights, budget):
+    """
+    Splits a point budget in proportion to weights, with integer counts summing exactly to the budget.
+    Remaining points go to the largest fractional shares, ties to the first entries (largest remainder method).
+
+    Args:
+        weights (list): Non-negative weights, at least one of them positive.
+        budget (int): Total number of points.
+
+    Returns:
+        np.ndarray: Number of points of each entry.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    shares = budget * weights / weights.sum()
+    counts = np.floor(shares).astype(np.int64)
+    remainder = budget - counts.sum()
+    if remainder > 0:
+        order = np.argsort(-(shares - counts), kind='stable')
+        counts[order[:remainder]] += 1
+    return counts
+
+def resample_block(block, count):
+    """
+    Deterministically trims or pads a point block to count points: evenly spaced points are kept when trimming,
+    and every point is repeated in turn when padding.
+
+    Args:
+        block (np.ndarray): (N, K) point block with N > 0.
+        count (int): Number of points to return.
+
+    Returns:
+        np.ndarray: (count, K) point block.
+    """
+    if count == len(block):
+        return block
+    indices = np.arange(count, dtype=np.int64) * len(block) // count
+    return block[indices]
+
+def apply_point_budget(emitted, config, budget):
+    """
+    Resamples the blocks of a frame so that together they hold exactly budget points.
+
+    The budget is shared in proportion to the surface area of the entities. When type weights are configured,
+    it is first split between the entity types present in the frame according to these weights, then within each
+    type in proportion to surface area.
+
+    Args:
+        emitted (list): (entity type, entity, block) of every block of the frame, as returned by process_entities.
+        config (Config): Configuration object containing the budget weights.
+        budget (int): Number of points of the frame.
+
+    Returns:
+        dict: id() of every resampled block mapped to its replacement.
+    """
+    areas = np.array([entity_surface_area(entity_type, entity, block) if len(block) else 0.0
+                      for entity_type, entity, block in emitted])
+    if not emitted or areas.sum() <= 0:
+        raise ValueError(f"The frame has no points to fill its budget of {budget} points.")
+
+    weights = areas
+    type_weights = getattr(config, 'point_budget_type_weights', None)
+    if type_weights is not None:
+        types = np.array([entity_type for entity_type, _, _ in emitted])
+        type_areas = {entity_type: areas[types == entity_type].sum() for entity_type in BUDGET_ENTITY_TYPES}
+        present = [entity_type for entity_type in BUDGET_ENTITY_TYPES if type_areas[entity_type] > 0 and type_weights[entity_type] > 0]
+        if not present:
+            raise ValueError("No entity type of the frame has a positive point budget weight.")
+        weights = np.array([type_weights[entity_type] * area / type_areas[entity_type] if entity_type in present else 0.0
+                            for entity_type, area in zip(types, areas)])
+
+    counts = allocate_point_budget(weights, budget)
+    return {id(block): resample_block(block, int(count)) for (_, _, block), count in zip(emitted, counts)}
+
+
+def cull_blocks(emitted, config, frustum):
+    """
+    Removes the points of a frame's blocks that are outside the headset's view.
+
+    Args:
+        emitted (list): (entity type, entity, block) of every block of the frame, as returned by process_entities.
+        config (Config): Configuration object holding the participant's ViewportCuller.
+        frustum (ViewFrustum): View frustum of the frame.
+
+    Returns:
+        dict: id() of every block mapped to its culled replacement.
+    """
+    return {id(block): config.viewport_culler.cull(block, frustum) for _, _, block in emitted}
 
 def normalize_points(points):
     """
@@ -141,7 +464,7 @@ def normalize_points(points):
     return points
 
 
-def process_frame(frame_path, config):
+def process_frame(frame_path, config, entity_lists=None, point_budget=0, frustum=None):
     """
     Processes a frame by reading entities (spheres, prisms, point clouds) from the frame file, transforming their points,
     and optionally normalizing the points.
@@ -149,32 +472,50 @@ def process_frame(frame_path, config):
     Args:
         frame_path (str): Path to the frame file.
         config (Config): Configuration object containing all parameters.
+        entity_lists (tuple, optional): Already parsed (prisms, spheres, point_clouds) of the frame. Default is None,
+            in which case the frame file is read.
+        point_budget (int, optional): Exact number of points of the frame, 0 keeps every generated point. Default is 0.
+        frustum (ViewFrustum, optional): Headset view of the frame, points outside it are removed before the point budget
+            is applied. Default is None.
 
     Returns:
         np.ndarray: Processed and optionally normalized points.
     """
-    prisms, spheres, point_clouds = read_attributes_from_file(frame_path, config)
+    if entity_lists is None:
+        entity_lists = read_attributes_from_file(frame_path, config)
+    prisms, spheres, point_clouds = entity_lists
     all_points = []
+    emitted = []
+    block_cache = getattr(config, 'actor_block_cache', None)
 
     if config.include_spheres == 'Yes':
-        process_entities(spheres, 'sphere', config, all_points)
+        emitted += process_entities(spheres, 'sphere', config, all_points, block_cache=block_cache)
 
     if config.include_prisms == 'Yes':
-        process_entities(prisms, 'prism', config, all_points)
+        emitted += process_entities(prisms, 'prism', config, all_points, block_cache=block_cache)
 
     if config.include_point_clouds == 'Yes':
         for pcd in point_clouds:
             pcd["Directory"] = os.path.join(config.dataset_folder_path, "PCDs", "Static")
-        process_entities(point_clouds, 'point_cloud', config, all_points)
+        emitted += process_entities(point_clouds, 'point_cloud', config, all_points, block_cache=block_cache)
+
+    if frustum is not None:
+        culled = cull_blocks(emitted, config, frustum)
+        all_points = [culled.get(id(block), block) for block in all_points]
+        emitted = [(entity_type, entity, culled[id(block)]) for entity_type, entity, block in emitted]
 
-    all_points = np.array(all_points, dtype=np.float32)
+    if point_budget:
+        resampled = apply_point_budget(emitted, config, point_budget)
+        all_points = [resampled.get(id(block), block) for block in all_points]
+
+    all_points = stack_point_blocks(all_points)
 
     if config.normalize == 'Yes':
         all_points = normalize_points(all_points)
 
     return all_points
 
-def process_frame_by_actor(frame_path, config):
+def process_frame_by_actor(frame_path, config, entity_lists=None, block_cache=None, point_budget=0, frustum=None):
     """
     Processes a frame by reading entities (spheres, prisms, point clouds) from the frame file, transforming their points,
     organizing points by actor, and optionally normalizing the points.
@@ -182,26 +523,45 @@ def process_frame_by_actor(frame_path, config):
     Args:
         frame_path (str): Path to the frame file.
         config (Config): Configuration object containing all parameters.
+        entity_lists (tuple, optional): Already parsed (prisms, spheres, point_clouds) of the frame. Default is None.
+        block_cache (ActorBlockCache, optional): Cache of the blocks generated for the previous frame. Default is None.
+        point_budget (int, optional): Exact number of points of the frame, 0 keeps every generated point. Default is 0.
+        frustum (ViewFrustum, optional): Headset view of the frame, points outside it are removed before the point budget
+            is applied. Default is None.
 
     Returns:
         dict: Dictionary with actor names as keys and their corresponding processed and optionally normalized points as values.
     """
-    prisms, spheres, point_clouds = read_attributes_from_file(frame_path, config)
+    if entity_lists is None:
+        entity_lists = read_attributes_from_file(frame_path, config)
+    prisms, spheres, point_clouds = entity_lists
     all_points_by_actor = {}
+    emitted = []
 
     if config.include_spheres == 'Yes':
-        process_entities(spheres, 'sphere', config, None, True, all_points_by_actor)
+        emitted += process_entities(spheres, 'sphere', config, None, True, all_points_by_actor, block_cache)
 
     if config.include_prisms == 'Yes':
-        process_entities(prisms, 'prism', config, None, True, all_points_by_actor)
+        emitted += process_entities(prisms, 'prism', config, None, True, all_points_by_actor, block_cache)
 
     if config.include_point_clouds == 'Yes':
         for pcd in point_clouds:
             pcd["Directory"] = os.path.join(config.dataset_folder_path, "PCDs", "Static")
-        process_entities(point_clouds, 'point_cloud', config, None, True, all_points_by_actor)
+        emitted += process_entities(point_clouds, 'point_cloud', config, None, True, all_points_by_actor, block_cache)
+
+    if frustum is not None:
+        culled = cull_blocks(emitted, config, frustum)
+        for actor_name, blocks in all_points_by_actor.items():
+            all_points_by_actor[actor_name] = [culled.get(id(block), block) for block in blocks]
+        emitted = [(entity_type, entity, culled[id(block)]) for entity_type, entity, block in emitted]
+
+    if point_budget:
+        resampled = apply_point_budget(emitted, config, point_budget)
+        for actor_name, blocks in all_points_by_actor.items():
+            all_points_by_actor[actor_name] = [resampled.get(id(block), block) for block in blocks]
 
     for actor_name in all_points_by_actor:
-        all_points_by_actor[actor_name] = np.array(all_points_by_actor[actor_name], dtype=np.float32)
+        all_points_by_actor[actor_name] = stack_point_blocks(all_points_by_actor[actor_name])
         if config.normalize == 'Yes' and all_points_by_actor[actor_name].size > 0:
             all_points_by_actor[actor_name] = normalize_points(all_points_by_actor[actor_name])
 
@@ -5,7 +5,7 @@ import base64
 import argparse
 from tqdm import tqdm
 
-from main_utils import check_and_create_directory, handle_experiment_participant, Config
+from main_utils import check_and_create_directory, handle_experiment, handle_experiment_participant, Config
 from file_operations import generate_dynamic_rendering_dict
 
 def main(config):
@@ -15,9 +15,14 @@ def main(config):
     #Generate dict of rendering information for dynamic objects
 
     for experiment, participants in tqdm(config.selected_experiment_participant_pairs.items(), desc="Experiments"):
+        handle_experiment(experiment, config)
         for participant in tqdm(participants, desc=f"Participants in {experiment}", leave=False):
             handle_experiment_participant(experiment, participant, config)
 
+    tqdm.write(config.asset_cache.summary())
+    if config.prism_template_cache is not None:
+        tqdm.write(config.prism_template_cache.summary())
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Process point cloud data.')
     parser.add_argument('--input_path', type=str, required=True, help='Path to the dataset folder')
@@ -35,6 +40,33 @@ if __name__ == "__main__":
     parser.add_argument('--pcds_point_cap', type=int, default=100000, help='Total number of points for PCDs')
     parser.add_argument('--ply_format', type=str, default="Binary", help='PLY as binary or ASCII')
     parser.add_argument('--normalize_point_cloud', type=str, default="No", help='Normalize the produced PLYs')
+    parser.add_argument('--asset_cache_mb', type=int, default=512, help='Memory budget in MB for cached static point-cloud assets')
+    parser.add_argument('--workers', type=int, default=1, help='Number of worker processes converting frames in parallel')
+    parser.add_argument('--single_pass', type=str, default="No", help='Read each frame file once per participant instead of a separate rendering-state scan')
+    parser.add_argument('--frame_cache_dir', type=str, default=None, help='Folder for the binary cache of parsed frames, reused by later runs')
+    parser.add_argument('--resume', type=str, default="No", help='Skip frames already converted with the same settings by a previous run')
+    parser.add_argument('--temporal_reuse', type=str, default="No", help='Reuse the points of dynamic actors unchanged since the previous frame')
+    parser.add_argument('--delta_keyframe_interval', type=int, default=0, help='Write every Nth frame as a full keyframe and the others as deltas against it (0 disables delta encoding)')
+    parser.add_argument('--packed_output', type=str, default="No", help='Write the frames of each participant to a single frames.pack container instead of one PLY per frame')
+    parser.add_argument('--coordinate_encoding', type=str, default="Float", help="Coordinate storage: 'Float' (float_precision bits), or quantized 'uint16' / 'int32' steps")
+    parser.add_argument('--quantization_error', type=float, default=0.05, help='Maximum coordinate error of quantized coordinates, in scene units')
+    parser.add_argument('--quantization_bounds', type=str, default="Frame", help="Quantization offset: bounding box of each 'Frame' or of the static scene of the 'Experiment'")
+    parser.add_argument('--pipeline_queue_depth', type=int, default=0, help='Convert frames through overlapping read/parse/generate/encode/write stages with queues of this many frames (0 disables the pipeline)')
+    parser.add_argument('--pipeline_writers', type=int, default=2, help='Number of writer threads of the staged pipeline')
+    parser.add_argument('--prism_template_cache', type=int, default=0, help='Number of prism face grids reused for prisms of the same shape (0 disables the cache)')
+    parser.add_argument('--prism_template_tolerance', type=float, default=0.001, help='Resolution at which prism shapes are compared by the template cache, in scene units')
+    parser.add_argument('--frame_point_budget', type=int, default=0, help='Exact number of points of every dynamic frame, shared between its actors (0 keeps every generated point)')
+    parser.add_argument('--point_budget_weights', type=str, default="Area", help="Share of the frame point budget: 'Area' (by surface area) or 'sphere,prism,point_cloud' weights of each entity type")
+    parser.add_argument('--downsample', type=str, default="Random", help="Downsampling of the actors: 'Random' (point clouds are shuffled down to --pcds_point_cap) or 'Voxel' (one point per voxel for every actor)")
+    parser.add_argument('--voxel_size', type=float, default=10.0, help='Edge length of the voxels of the Voxel downsampling mode, in scene units')
+    parser.add_argument('--voxel_representative', type=str, default="Mean", help="Point kept for each voxel: 'Mean' of its points or the point 'Nearest' to its center")
+    parser.add_argument('--lod_levels', type=int, default=1, help='Number of nested levels of detail written in every PLY file (1 disables levels of detail)')
+    parser.add_argument('--lod_ratio', type=float, default=0.5, help='Share of the points of a level of detail kept by the next coarser level')
+    parser.add_argument('--viewport_culling', type=str, default="No", help="Remove the points outside the participant's headset view, using HMD_data.csv")
+    parser.add_argument('--viewport_fov_horizontal', type=float, default=97.0, help='Horizontal field of view of the headset in degrees')
+    parser.add_argument('--viewport_fov_vertical', type=float, default=93.0, help='Vertical field of view of the headset in degrees')
+    parser.add_argument('--viewport_max_distance', type=float, default=0.0, help='Remove points further than this distance from the headset, in scene units (0 disables the cutoff)')
+    parser.add_argument('--tile_grid', type=str, default=None, help="Partition every frame and StaticPCDs file into an 'X,Y,Z' grid of tiles stored contiguously")
 
     args = parser.parse_args()
 
@@ -44,7 +76,10 @@ if __name__ == "__main__":
 
         output_path = args.output_path if args.output_path else os.path.join(os.path.dirname(os.path.abspath(__file__)), "pcdDataset")
 
-        dynamic_actors_rendering_dict = generate_dynamic_rendering_dict(args.input_path, experiment_dict)
+        # In single pass mode the visibility scores are computed per participant while reading the frames
+        dynamic_actors_rendering_dict = None
+        if args.single_pass != "Yes" and not args.frame_cache_dir:
+            dynamic_actors_rendering_dict = generate_dynamic_rendering_dict(args.input_path, experiment_dict)
 
         config = Config(
             dataset_folder_path=args.input_path,
@@ -62,7 +97,34 @@ if __name__ == "__main__":
             ply_format=args.ply_format,
             pcds_point_cap=args.pcds_point_cap,
             normalize=args.normalize_point_cloud,
-            dynamic_actors_rendering_dict=dynamic_actors_rendering_dict
+            dynamic_actors_rendering_dict=dynamic_actors_rendering_dict,
+            asset_cache_mb=args.asset_cache_mb,
+            workers=args.workers,
+            single_pass=args.single_pass,
+            frame_cache_dir=args.frame_cache_dir,
+            resume=args.resume,
+            temporal_reuse=args.temporal_reuse,
+            delta_keyframe_interval=args.delta_keyframe_interval,
+            packed_output=args.packed_output,
+            coordinate_encoding=args.coordinate_encoding,
+            quantization_error=args.quantization_error,
+            quantization_bounds=args.quantization_bounds,
+            pipeline_queue_depth=args.pipeline_queue_depth,
+            pipeline_writers=args.pipeline_writers,
+            prism_template_cache=args.prism_template_cache,
+            prism_template_tolerance=args.prism_template_tolerance,
+            frame_point_budget=args.frame_point_budget,
+            point_budget_weights=args.point_budget_weights,
+            downsample=args.downsample,
+            voxel_size=args.voxel_size,
+            voxel_representative=args.voxel_representative,
+            lod_levels=args.lod_levels,
+            lod_ratio=args.lod_ratio,
+            viewport_culling=args.viewport_culling,
+            viewport_fov_horizontal=args.viewport_fov_horizontal,
+            viewport_fov_vertical=args.viewport_fov_vertical,
+            viewport_max_distance=args.viewport_max_distance,
+            tile_grid=args.tile_grid
         )
 
         main(config)
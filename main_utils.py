@@ -1,17 +1,37 @@
 import os
+import re
 import sys
+import json
 import time
 import traceback
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from tqdm import tqdm
 from scipy.spatial.transform import Rotation as R
-from file_operations import save_ply
-from frame_processing import process_frame, process_frame_by_actor
+from file_operations import (save_ply, merge_actor_points, merge_lod_points, get_ply_properties, encode_points, write_ply_records,
+                             sort_frame_files, parse_frame_lines, parse_frame_attributes, fetch_visibility_score,
+                             ingest_participant_frames, apply_visibility_scores)
+from asset_cache import AssetCache
+from viewport_culling import ViewportCuller
+from tile_partition import parse_tile_grid, partition_points
+from rect_prism_converter import PrismTemplateCache
+from frame_processing import process_frame, process_frame_by_actor, ActorBlockCache
+from delta_frames import write_keyframe, write_delta, delta_keyframe, KEYFRAME_EXTENSION, DELTA_EXTENSION
+from frame_container import FramePackWriter, PACK_FILE
+from pipeline import Pipeline, PipelineStage
 
 class Config:
     def __init__(self, dataset_folder_path, output_file_path, selected_experiment_participant_pairs,
                  sphere_density=0.1, prism_density=0.02, include_spheres="Yes", include_prisms="Yes", 
                  include_point_clouds="Yes", FPS=30, material_color="Grey scale", light_color="Grey scale", 
-                 float_precision=32, ply_format="Binary", pcds_point_cap=100000, normalize="No",dynamic_actors_rendering_dict=None):
+                 float_precision=32, ply_format="Binary", pcds_point_cap=100000, normalize="No",dynamic_actors_rendering_dict=None,
+                 asset_cache_mb=512, workers=1, single_pass="No",
+                 frame_cache_dir=None, resume="No", temporal_reuse="No", delta_keyframe_interval=0,
+                 packed_output="No", coordinate_encoding="Float", quantization_error=0.05, quantization_bounds="Frame",
+                 pipeline_queue_depth=0, pipeline_writers=2, prism_template_cache=0, prism_template_tolerance=0.001,
+                 frame_point_budget=0, point_budget_weights="Area", downsample="Random", voxel_size=10.0,
+                 voxel_representative="Mean", lod_levels=1, lod_ratio=0.5, viewport_culling="No",
+                 viewport_fov_horizontal=97.0, viewport_fov_vertical=93.0, viewport_max_distance=0.0, tile_grid=None):
         self.dataset_folder_path = dataset_folder_path
         self.output_file_path = output_file_path
         self.selected_experiment_participant_pairs = selected_experiment_participant_pairs
@@ -28,6 +48,86 @@ class Config:
         self.pcds_point_cap = pcds_point_cap
         self.normalize = normalize
         self.dynamic_actors_rendering_dict=dynamic_actors_rendering_dict
+        self.asset_cache_mb = asset_cache_mb
+        self.asset_cache = AssetCache(asset_cache_mb * 1024**2)
+        self.workers = max(1, int(workers))
+        self.single_pass = single_pass
+        self.frame_cache_dir = frame_cache_dir
+        self.resume = resume
+        self.temporal_reuse = temporal_reuse
+        self.actor_block_cache = ActorBlockCache() if temporal_reuse == "Yes" else None
+        self.delta_keyframe_interval = max(0, int(delta_keyframe_interval))
+        if self.delta_keyframe_interval and normalize == "Yes":
+            raise ValueError("Delta-encoded output cannot be combined with normalization, normalized actors are not comparable between frames.")
+        self.packed_output = packed_output
+        if self.delta_keyframe_interval and packed_output == "Yes":
+            raise ValueError("Delta-encoded output cannot be combined with packed output.")
+        self.coordinate_encoding = coordinate_encoding
+        self.quantization_error = float(quantization_error)
+        self.quantization_bounds = quantization_bounds
+        # Offset shared by every file of the current experiment, set from its static actors in Experiment bounds mode
+        self.quantization_offset = None
+        if coordinate_encoding != "Float":
+            if self.quantization_error <= 0:
+                raise ValueError("The quantization error bound must be positive.")
+            if quantization_bounds not in ("Frame", "Experiment"):
+                raise ValueError("Invalid quantization bounds. Use 'Frame' or 'Experiment'.")
+            if self.delta_keyframe_interval and quantization_bounds != "Experiment":
+                raise ValueError("Delta-encoded output with quantized coordinates requires Experiment quantization bounds.")
+        self.pipeline_queue_depth = max(0, int(pipeline_queue_depth))
+        self.pipeline_writers = max(1, int(pipeline_writers))
+        if self.pipeline_queue_depth and (self.workers > 1 or self.delta_keyframe_interval or packed_output == "Yes"):
+            raise ValueError("The staged pipeline writes one PLY per frame and cannot be combined with workers, delta-encoded or packed output.")
+        # The tolerance only changes the output when templates are used
+        self.prism_template_tolerance = float(prism_template_tolerance) if prism_template_cache > 0 else None
+        self.prism_template_cache = None
+        if prism_template_cache > 0:
+            if self.prism_template_tolerance <= 0:
+                raise ValueError("The prism template tolerance must be positive.")
+            self.prism_template_cache = PrismTemplateCache(prism_template_cache, self.prism_template_tolerance)
+        self.frame_point_budget = max(0, int(frame_point_budget))
+        self.point_budget_weights = point_budget_weights
+        # Weights of the sphere, prism and point cloud shares of the budget, None to share it by surface area only
+        self.point_budget_type_weights = None
+        if point_budget_weights != "Area":
+            try:
+                weights = [float(weight) for weight in point_budget_weights.split(",")]
+            except ValueError:
+                weights = []
+            if len(weights) != 3 or min(weights) < 0 or sum(weights) <= 0:
+                raise ValueError("Invalid point budget weights. Use 'Area' or three non-negative 'sphere,prism,point_cloud' weights.")
+            self.point_budget_type_weights = dict(zip(("sphere", "prism", "point_cloud"), weights))
+        if downsample not in ("Random", "Voxel"):
+            raise ValueError("Invalid downsampling mode. Use 'Random' or 'Voxel'.")
+        self.downsample = downsample
+        self.voxel_size = float(voxel_size)
+        self.voxel_representative = voxel_representative
+        if downsample == "Voxel":
+            if self.voxel_size <= 0:
+                raise ValueError("The voxel size must be positive.")
+            if voxel_representative not in ("Mean", "Nearest"):
+                raise ValueError("Invalid voxel representative. Use 'Mean' or 'Nearest'.")
+        self.lod_levels = max(1, int(lod_levels))
+        self.lod_ratio = float(lod_ratio)
+        if self.lod_levels > 1:
+            if not 0 < self.lod_ratio < 1:
+                raise ValueError("The level of detail ratio must be between 0 and 1.")
+            if self.delta_keyframe_interval:
+                raise ValueError("Levels of detail cannot be combined with delta-encoded output, their points are not grouped by actor.")
+        self.viewport_culling = viewport_culling
+        self.viewport_fov_horizontal = float(viewport_fov_horizontal)
+        self.viewport_fov_vertical = float(viewport_fov_vertical)
+        self.viewport_max_distance = max(0.0, float(viewport_max_distance))
+        if viewport_culling == "Yes" and not (0 < self.viewport_fov_horizontal < 180 and 0 < self.viewport_fov_vertical < 180):
+            raise ValueError("The viewport field of view must be between 0 and 180 degrees.")
+        # Headset poses of the current participant, loaded by handle_experiment_participant
+        self.viewport_culler = None
+        self.tile_grid = tile_grid
+        self.tile_shape = parse_tile_grid(tile_grid) if tile_grid else None
+        if self.tile_shape is not None and (self.delta_keyframe_interval or self.lod_levels > 1):
+            raise ValueError("Tiled output cannot be combined with delta-encoded output or levels of detail, they order the points differently.")
+        # Bounds of the tile grid shared by every file of the current experiment, from its static actors
+        self.tile_bounds = None
 
 def check_and_create_directory(path):
     if not os.path.exists(path):
@@ -39,6 +139,154 @@ def copy_file(src, dest):
         with open(dest, 'wb') as dest_file:
             dest_file.write(src_file.read())
 
+# Settings changing the StaticPCDs; the dynamic frames depend on every output setting
+STATIC_OUTPUT_SETTINGS = ["sphere_density", "prism_density", "include_spheres", "include_prisms", "include_point_clouds",
+                          "material_color", "light_color", "float_precision", "ply_format", "pcds_point_cap", "normalize",
+                          "coordinate_encoding", "quantization_error", "quantization_bounds", "prism_template_tolerance",
+                          "downsample", "voxel_size", "voxel_representative", "lod_levels", "lod_ratio", "tile_grid"]
+OUTPUT_SETTINGS = STATIC_OUTPUT_SETTINGS + ["delta_keyframe_interval", "packed_output", "frame_point_budget", "point_budget_weights",
+                                            "viewport_culling", "viewport_fov_horizontal", "viewport_fov_vertical", "viewport_max_distance"]
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_FLUSH_INTERVAL = 30
+
+def config_fingerprint(config, settings=OUTPUT_SETTINGS):
+    """
+    Returns the conversion settings that change the content of the generated PLY files.
+
+    Args:
+        config (Config): Configuration object containing all parameters.
+        settings (list, optional): Names of the settings to include. Default is OUTPUT_SETTINGS (dynamic frames).
+
+    Returns:
+        dict: Setting names mapped to their values.
+    """
+    return {setting: getattr(config, setting) for setting in settings}
+
+def static_sources(static_actors_path, config):
+    """
+    Returns the (size, mtime) signature of the files the StaticPCDs are generated from: the StaticActors.txt file
+    and the point-cloud assets of its static point clouds.
+
+    Args:
+        static_actors_path (str): Path to the StaticActors.txt file of the experiment.
+        config (Config): Configuration object containing all parameters.
+
+    Returns:
+        dict: File paths, relative to the dataset folder, mapped to their signature. Missing assets map to None.
+    """
+    def signature(file_path):
+        if not os.path.exists(file_path):
+            return None
+        stat = os.stat(file_path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    file_paths = [static_actors_path]
+    if config.include_point_clouds == "Yes":
+        _, _, point_clouds = parse_frame_attributes(static_actors_path)
+        asset_folder = os.path.join(config.dataset_folder_path, "PCDs", "Static")
+        file_paths += sorted({os.path.join(asset_folder, f'{pcd["Name"]}.txt') for pcd in point_clouds})
+    return {os.path.relpath(file_path, config.dataset_folder_path): signature(file_path) for file_path in file_paths}
+
+def load_manifest(output_path):
+    """
+    Loads the manifest of an output folder.
+
+    Args:
+        output_path (str): Path to a DynamicActors or StaticPCDs output folder.
+
+    Returns:
+        dict or None: The manifest, or None if it does not exist or cannot be read.
+    """
+    manifest_path = os.path.join(output_path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path, 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def write_manifest(output_path, manifest):
+    """
+    Atomically writes the manifest of an output folder.
+    """
+    manifest_path = os.path.join(output_path, MANIFEST_FILE)
+    with open(manifest_path + ".tmp", 'w') as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+def verified_outputs(output_path, manifest, settings):
+    """
+    Lists the files recorded in a manifest that still exist with their recorded size.
+
+    Args:
+        output_path (str): Path to the output folder.
+        manifest (dict or None): Manifest of the folder.
+        settings (dict): Fingerprint of the current configuration.
+
+    Returns:
+        set: Names of the files that can be kept. Empty if the manifest was written with other settings.
+    """
+    if manifest is None or manifest.get("settings") != settings:
+        return set()
+    verified = set()
+    for name, size in manifest.get("files", {}).items():
+        file_path = os.path.join(output_path, name)
+        if os.path.exists(file_path) and os.path.getsize(file_path) == size:
+            verified.add(name)
+    return verified
+
+def static_actors_up_to_date(static_actors_path, output_path, config):
+    """
+    Checks whether the StaticPCDs folder was produced from the same source files and static settings.
+
+    Args:
+        static_actors_path (str): Path to the StaticActors.txt file of the experiment.
+        output_path (str): Path to the StaticPCDs folder.
+        config (Config): Configuration object containing all parameters.
+
+    Returns:
+        bool: True if the existing static PLY files can be reused as is.
+    """
+    manifest = load_manifest(output_path)
+    if manifest is None:
+        return False
+
+    return (manifest.get("sources") == static_sources(static_actors_path, config)
+            and verified_outputs(output_path, manifest, config_fingerprint(config, STATIC_OUTPUT_SETTINGS)) == set(manifest.get("files", {})))
+
+def handle_experiment(experiment, config):
+    """
+    Converts the static actors of an experiment once, shared by all of its participants.
+    The conversion is skipped when StaticPCDs already holds the output for the same settings.
+    """
+    try:
+        static_actors_path = os.path.join(config.dataset_folder_path, 'Metadata', 'StaticActors', experiment, 'StaticActors.txt')
+        assert os.path.exists(static_actors_path), f"Static actors file '{static_actors_path}' does not exist."
+        static_output_path = os.path.join(config.output_file_path, experiment, "StaticPCDs")
+        check_and_create_directory(static_output_path)
+
+        config.quantization_offset = None
+        config.tile_bounds = None
+        if static_actors_up_to_date(static_actors_path, static_output_path, config):
+            tqdm.write(f"Static actors of '{experiment}' are up to date, skipping.")
+            bounds = load_manifest(static_output_path).get("bounds")
+            if config.coordinate_encoding != "Float" and config.quantization_bounds == "Experiment":
+                config.quantization_offset = (bounds or [None])[0]
+            if config.tile_shape is not None and config.normalize != "Yes":
+                config.tile_bounds = bounds
+            return
+
+        process_static_actors(static_actors_path, static_output_path, config)
+
+    except AssertionError as e:
+        tqdm.write(f"Error in processing static actors of experiment '{experiment}': {e}", file=sys.stderr)
+        tqdm.write(traceback.format_exc(), file=sys.stderr)
+    except Exception as e:
+        tqdm.write(f"Unexpected error in processing static actors of experiment '{experiment}': {e}", file=sys.stderr)
+        tqdm.write(traceback.format_exc(), file=sys.stderr)
+
 def handle_experiment_participant(experiment, participant, config):
     try:
         experiment_path = os.path.join(config.dataset_folder_path, 'Experiments', experiment, participant)
@@ -53,16 +301,18 @@ def handle_experiment_participant(experiment, participant, config):
         frames_path = os.path.join(experiment_path, 'DynamicActors')
         assert os.path.exists(frames_path), f"Frames path '{frames_path}' does not exist."
 
-        static_actors_path = os.path.join(config.dataset_folder_path, 'Metadata', 'StaticActors', experiment, 'StaticActors.txt')
-        static_output_path = os.path.join(config.output_file_path, experiment, "StaticPCDs")
-        check_and_create_directory(static_output_path)
-
-        process_static_actors(static_actors_path, static_output_path, config)
-
         dynamic_output_path = os.path.join(config.output_file_path, experiment, participant, "DynamicActors")
         check_and_create_directory(dynamic_output_path)
 
-        process_frames(frames_path, dynamic_output_path, config)
+        config.viewport_culler = None
+        if config.viewport_culling == "Yes":
+            config.viewport_culler = ViewportCuller(HMD_csv_path, config.viewport_fov_horizontal, config.viewport_fov_vertical,
+                                                    config.viewport_max_distance)
+
+        cache_path = os.path.join(config.frame_cache_dir, experiment, participant) if config.frame_cache_dir else None
+        process_frames(frames_path, dynamic_output_path, config, cache_path)
+        if config.viewport_culler is not None:
+            tqdm.write(config.viewport_culler.summary())
 
     except AssertionError as e:
         tqdm.write(f"Error in processing experiment '{experiment}', participant '{participant}': {e}", file=sys.stderr)
@@ -75,29 +325,443 @@ def process_static_actors(static_actors_path, output_path, config):
     start_time = time.time()
     tqdm.write(f"Processing static actors...")
 
+    # Sources are signed before the conversion reads them, so a file edited meanwhile is converted again next time
+    sources = static_sources(static_actors_path, config)
     static_points_by_actor = process_frame_by_actor(static_actors_path, config)
     
     end_time = time.time()
     tqdm.write(f"Static actors processed in {end_time - start_time:.2f} seconds.")
+
+    # The bounding box of the static scene gives the quantization offset shared by the whole experiment
+    coordinates = [points[:, :3] for points in static_points_by_actor.values() if len(points)]
+    bounds = None
+    if coordinates:
+        coordinates = np.concatenate(coordinates).astype(np.float64)
+        bounds = [coordinates.min(axis=0).tolist(), coordinates.max(axis=0).tolist()]
+    if config.coordinate_encoding != "Float" and config.quantization_bounds == "Experiment":
+        if bounds is None:
+            tqdm.write("No static points to bound the experiment, coordinates are quantized per frame.", file=sys.stderr)
+        config.quantization_offset = bounds[0] if bounds else None
+    # Normalized frames have their own coordinates, their tiles follow the bounding box of each frame
+    if config.tile_shape is not None and config.normalize != "Yes":
+        config.tile_bounds = bounds
     
+    # Invalidate the previous manifest before rewriting the files
+    manifest_path = os.path.join(output_path, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    saved_files = {}
     for name, points in tqdm(static_points_by_actor.items(), desc="Saving Static PCDs", leave=False):
         output_ply_path = os.path.join(output_path, f"{name}.ply")
         try:
-            save_ply(output_ply_path, points, config)
+            if config.lod_levels > 1:
+                lod_points, lod_comments = merge_lod_points({name: points}, config.lod_levels, config.lod_ratio)
+                save_ply(output_ply_path, lod_points, config, lod_comments)
+            elif config.tile_shape is not None:
+                tiled_points, tile_comments = partition_points(points, config.tile_shape, config.tile_bounds)
+                save_ply(output_ply_path, tiled_points, config, tile_comments)
+            else:
+                save_ply(output_ply_path, points, config)
+            saved_files[f"{name}.ply"] = os.path.getsize(output_ply_path)
         except Exception as e:
             tqdm.write(f"Error saving file '{output_ply_path}': {e}", file=sys.stderr)
             tqdm.write(traceback.format_exc(), file=sys.stderr)
 
-def process_frames(frames_path, output_path, config):
-    for frame_name in tqdm(sorted(os.listdir(frames_path)), desc="Processing frames", leave=False):
-        frame_path = os.path.join(frames_path, frame_name)
+    if len(saved_files) == len(static_points_by_actor):
+        write_manifest(output_path, {"settings": config_fingerprint(config, STATIC_OUTPUT_SETTINGS),
+                                     "sources": sources,
+                                     "bounds": bounds,
+                                     "files": saved_files})
+
+def select_frames(frames_path, config):
+    """
+    Lists the frame files of a participant that are kept for the configured FPS.
+
+    Args:
+        frames_path (str): Path to the DynamicActors folder of a participant.
+        config (Config): Configuration object containing the FPS.
+
+    Returns:
+        list: Selected frame file names, sorted by frame number (playback order).
+    """
+    selected_frames = []
+    # Frames are converted in playback order, temporal reuse and delta keyframes compare each frame with the previous ones
+    for frame_name in sort_frame_files(os.listdir(frames_path)):
         frame_number = int((frame_name.split('.')[0]).split('_')[1])
-        
+
         if config.FPS in [1, 2, 3, 4, 5, 6, 10, 12, 15, 20, 30, 60] and frame_number % (60 // config.FPS) != 0:
             continue
-        
-        frame_points = process_frame(frame_path, config)
+        selected_frames.append(frame_name)
+    return selected_frames
+
+def frame_frustum(frame_path, config):
+    """
+    Returns the headset view frustum of a frame, or None when viewport culling is disabled.
+    """
+    if config.viewport_culler is None:
+        return None
+    frame_number = int(re.findall(r'\d+', os.path.basename(frame_path))[0])
+    return config.viewport_culler.frustum(frame_number)
 
-        output_ply_path = os.path.join(output_path, f"{frame_name.split('.')[0]}.ply")
+def generate_frame_points(frame_path, config, entity_lists=None):
+    """
+    Generates the points of a frame, with the header comments describing them.
+
+    Args:
+        frame_path (str): Path to the frame text file.
+        config (Config): Configuration object containing all parameters.
+        entity_lists (tuple, optional): Already parsed actors of the frame, with their visibility scores. Default is None.
+
+    Returns:
+        tuple: ((N, K) points of the frame, list of header comments)
+    """
+    if config.normalize == "Yes":
+        points = process_frame(frame_path, config, entity_lists, config.frame_point_budget, frame_frustum(frame_path, config))
+        if config.lod_levels > 1:
+            return merge_lod_points({"frame": points}, config.lod_levels, config.lod_ratio)
+        if config.tile_shape is not None:
+            return partition_points(points, config.tile_shape)
+        return points, []
+    points_by_actor = process_frame_by_actor(frame_path, config, entity_lists, config.actor_block_cache, config.frame_point_budget,
+                                             frame_frustum(frame_path, config))
+    if config.lod_levels > 1:
+        # Levels of detail interleave the actors, the header records the size of each level instead
+        return merge_lod_points(points_by_actor, config.lod_levels, config.lod_ratio)
+    if config.tile_shape is not None:
+        # Tiles interleave the actors, the header records the tile index instead
+        points, _ = merge_actor_points(points_by_actor)
+        return partition_points(points, config.tile_shape, config.tile_bounds)
+    # Per-actor point counts are recorded in the header so readers can select actors
+    return merge_actor_points(points_by_actor)
+
+def convert_frame(frame_path, output_ply_path, config, entity_lists=None):
+    """
+    Converts a single frame file to a PLY file.
+
+    Args:
+        frame_path (str): Path to the frame text file.
+        output_ply_path (str): Path of the PLY file to write.
+        config (Config): Configuration object containing all parameters.
+        entity_lists (tuple, optional): Already parsed actors of the frame, with their visibility scores. Default is None.
+
+    Returns:
+        str or None: Error report for the frame, or None if the conversion succeeded.
+    """
+    try:
         check_and_create_directory(os.path.dirname(output_ply_path))
-        save_ply(output_ply_path, frame_points, config)
+        frame_points, comments = generate_frame_points(frame_path, config, entity_lists)
+        save_ply(output_ply_path, frame_points, config, comments)
+    except Exception as e:
+        return f"Error processing frame '{frame_path}': {e}\n{traceback.format_exc()}"
+    return None
+
+def unpack_frame(packed_frame):
+    """
+    Returns the attribute lists of a frame ingested in one pass, with its visibility scores, or None for a frame read during the conversion.
+    """
+    return packed_frame.entity_lists() if packed_frame is not None else None
+
+_worker_config = None
+
+def _init_frame_worker(config):
+    """
+    Process pool initializer, receives the configuration once per worker.
+    """
+    global _worker_config
+    _worker_config = config
+
+CACHE_COUNTERS = [("asset_cache", "hits"), ("asset_cache", "misses"),
+                  ("actor_block_cache", "reused"), ("actor_block_cache", "generated"),
+                  ("prism_template_cache", "hits"), ("prism_template_cache", "misses"),
+                  ("viewport_culler", "points_kept"), ("viewport_culler", "points_culled")]
+
+def _read_cache_counters(config):
+    return [getattr(getattr(config, cache), counter) if getattr(config, cache, None) is not None else 0
+            for cache, counter in CACHE_COUNTERS]
+
+def _add_cache_counters(config, deltas):
+    for (cache, counter), delta in zip(CACHE_COUNTERS, deltas):
+        if getattr(config, cache, None) is not None:
+            setattr(getattr(config, cache), counter, getattr(getattr(config, cache), counter) + delta)
+
+def convert_delta_group(group, config):
+    """
+    Converts a group of consecutive frames to one keyframe followed by delta files relative to it.
+
+    Args:
+        group (list): (frame_path, output_path, entity_lists) tuples, the first one being the keyframe.
+        config (Config): Configuration object containing all parameters.
+
+    Returns:
+        list: Error report of each frame, or None if it was converted.
+    """
+    errors = []
+    keyframe_blocks = None
+    for frame_path, output_path, entity_lists in group:
+        if keyframe_blocks is None and errors:
+            errors.append(f"Error processing frame '{frame_path}': the keyframe of its group could not be converted.\n")
+            continue
+        try:
+            blocks_by_actor = process_frame_by_actor(frame_path, config, entity_lists, config.actor_block_cache, config.frame_point_budget,
+                                                     frame_frustum(frame_path, config))
+            check_and_create_directory(os.path.dirname(output_path))
+            if keyframe_blocks is None:
+                write_keyframe(output_path, blocks_by_actor, config)
+                keyframe_blocks, keyframe_name = blocks_by_actor, os.path.basename(output_path)
+            else:
+                write_delta(output_path, blocks_by_actor, keyframe_blocks, keyframe_name, config)
+        except Exception as e:
+            errors.append(f"Error processing frame '{frame_path}': {e}\n{traceback.format_exc()}")
+            continue
+        errors.append(None)
+    return errors
+
+def encode_frame(frame_path, config, entity_lists=None):
+    """
+    Converts a single frame file to the PLY records stored in a packed frame container.
+
+    Args:
+        frame_path (str): Path to the frame text file.
+        config (Config): Configuration object containing all parameters.
+        entity_lists (tuple, optional): Already parsed actors of the frame, with their visibility scores. Default is None.
+
+    Returns:
+        tuple: (error report or None, (structured records, header comments) or None)
+    """
+    try:
+        frame_points, comments = generate_frame_points(frame_path, config, entity_lists)
+        records, encoding_comments = encode_points(frame_points, config)
+        return None, (records, comments + encoding_comments)
+    except Exception as e:
+        return f"Error processing frame '{frame_path}': {e}\n{traceback.format_exc()}", None
+
+def convert_frame_group(group, config):
+    """
+    Converts a group of frames, as full PLY files, as a keyframe plus deltas in delta-encoded mode,
+    or as records returned to the caller in packed mode.
+
+    Returns:
+        list: (error report or None, encoded frame or None) pair of each frame. Frames are only returned encoded in packed mode.
+    """
+    # Frames ingested in one pass are only decoded to attribute lists now, one group at a time
+    group = [(frame_path, output_path, unpack_frame(packed_frame)) for frame_path, output_path, packed_frame in group]
+    if config.packed_output == "Yes":
+        return [encode_frame(frame_path, config, entity_lists) for frame_path, _, entity_lists in group]
+    if config.delta_keyframe_interval:
+        return [(error, None) for error in convert_delta_group(group, config)]
+    return [(convert_frame(frame_path, output_path, config, entity_lists), None) for frame_path, output_path, entity_lists in group]
+
+def _convert_group_in_worker(group):
+    before = _read_cache_counters(_worker_config)
+    results = convert_frame_group(group, _worker_config)
+    return results, [after - start for after, start in zip(_read_cache_counters(_worker_config), before)]
+
+def run_frame_pipeline(tasks, config):
+    """
+    Converts frames through the staged pipeline: reading, parsing, point generation, encoding and writing run in
+    their own threads connected by queues of config.pipeline_queue_depth frames, with several writer threads.
+
+    Args:
+        tasks (list): Lists of (frame_path, output_path, packed_frame) tuples, one list per frame.
+        config (Config): Configuration object containing all parameters.
+
+    Yields:
+        tuple: (group, results) of each frame in completion order, as run_frame_tasks.
+    """
+    def read(task):
+        frame_path, output_path, packed_frame = task
+        text = None
+        if packed_frame is None:
+            with open(frame_path, 'r') as file:
+                text = file.read()
+        return frame_path, output_path, packed_frame, text
+
+    def parse(frame):
+        frame_path, output_path, packed_frame, text = frame
+        entity_lists = unpack_frame(packed_frame)
+        if entity_lists is None:
+            actor_rendering_dict = fetch_visibility_score(frame_path, config.dynamic_actors_rendering_dict)
+            entity_lists = apply_visibility_scores(parse_frame_lines(text.splitlines()), actor_rendering_dict)
+        return frame_path, output_path, entity_lists
+
+    def generate(frame):
+        frame_path, output_path, entity_lists = frame
+        return (output_path,) + generate_frame_points(frame_path, config, entity_lists)
+
+    def encode(frame):
+        output_path, frame_points, comments = frame
+        records, encoding_comments = encode_points(frame_points, config)
+        return output_path, records, comments + encoding_comments
+
+    def write(frame):
+        output_path, records, comments = frame
+        check_and_create_directory(os.path.dirname(output_path))
+        write_ply_records(output_path, records, config, comments)
+
+    pipeline = Pipeline([PipelineStage("read", read), PipelineStage("parse", parse), PipelineStage("generate", generate),
+                         PipelineStage("encode", encode), PipelineStage("write", write, config.pipeline_writers)],
+                        config.pipeline_queue_depth)
+    groups = {group[0][0]: group for group in tasks}
+    for frame_path, _, error in pipeline.run((group[0][0], group[0]) for group in tasks):
+        yield groups.pop(frame_path), [(error, None)]
+    tqdm.write(pipeline.summary())
+
+def run_frame_tasks(tasks, config):
+    """
+    Converts frame groups serially, in a process pool or through the staged pipeline.
+
+    Args:
+        tasks (list): Lists of (frame_path, output_path, packed_frame) tuples, one list per group of frames. packed_frame is
+            the PackedFrame of a frame ingested in one pass, or None if the frame file is read during the conversion.
+        config (Config): Configuration object containing all parameters.
+
+    Yields:
+        tuple: (group, results) where results holds the (error report or None, encoded frame or None) pair of
+            each frame of the group. Groups come in task order, except with the pipeline where writes may finish out of order.
+    """
+    if config.pipeline_queue_depth:
+        yield from run_frame_pipeline(tasks, config)
+        return
+
+    workers = min(config.workers, len(tasks))
+    if workers <= 1:
+        for group in tasks:
+            yield group, convert_frame_group(group, config)
+        return
+
+    # Results are consumed in frame order so progress and error reports match a serial run
+    chunksize = max(1, len(tasks) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_frame_worker, initargs=(config,)) as executor:
+        for group, (results, deltas) in zip(tasks, executor.map(_convert_group_in_worker, tasks, chunksize=chunksize)):
+            _add_cache_counters(config, deltas)
+            yield group, results
+
+def output_file_name(frame_name, position, config):
+    """
+    Returns the output file name of a frame: frame_N.ply, or frame_N.delta for the non-keyframes of delta-encoded output.
+    In packed mode, the name of the frame's entry in the container, frame_N.
+
+    Args:
+        frame_name (str): Name of the frame text file.
+        position (int): Position of the frame among the selected frames.
+        config (Config): Configuration object containing all parameters.
+    """
+    if config.packed_output == "Yes":
+        return frame_name.split('.')[0]
+    interval = config.delta_keyframe_interval
+    extension = DELTA_EXTENSION if interval and position % interval else KEYFRAME_EXTENSION
+    return f"{frame_name.split('.')[0]}{extension}"
+
+def delta_groups_completed(output_path, groups, completed, manifest):
+    """
+    Checks the delta-encoded output left by an earlier run against the keyframe groups of this one.
+
+    Files written with another grouping are removed with their manifest entry: the keyframe or delta file a frame no
+    longer uses, since readers take frame_N.ply before frame_N.delta. Deltas referring to another keyframe than the
+    first frame of their group are not kept as converted.
+
+    Args:
+        output_path (str): Path to the DynamicActors output folder.
+        groups (list): Lists of (frame name, output name) pairs, the first one being the keyframe of the group.
+        completed (set): Output names verified by the manifest.
+        manifest (dict): Manifest of the folder, updated in place.
+
+    Returns:
+        set: Output names that can be kept.
+    """
+    kept = set(completed)
+    for group in groups:
+        keyframe_output = group[0][1]
+        for _, output_name in group:
+            stem, extension = os.path.splitext(output_name)
+            stale_name = stem + (DELTA_EXTENSION if extension == KEYFRAME_EXTENSION else KEYFRAME_EXTENSION)
+            manifest["files"].pop(stale_name, None)
+            if os.path.exists(os.path.join(output_path, stale_name)):
+                os.remove(os.path.join(output_path, stale_name))
+            if output_name in kept and extension == DELTA_EXTENSION:
+                try:
+                    if delta_keyframe(os.path.join(output_path, output_name)) != keyframe_output:
+                        kept.discard(output_name)
+                except (OSError, ValueError):
+                    kept.discard(output_name)
+    return kept
+
+def process_frames(frames_path, output_path, config, cache_path=None):
+    selected_frames = select_frames(frames_path, config)
+
+    # The manifest records converted frames so an interrupted run can be resumed
+    settings = config_fingerprint(config)
+    manifest = load_manifest(output_path)
+    completed = verified_outputs(output_path, manifest, settings) if config.resume == "Yes" else set()
+    if manifest is None or manifest.get("settings") != settings:
+        manifest = {"settings": settings, "files": {}}
+
+    pack_writer = None
+    if config.packed_output == "Yes":
+        # All frames go to one container. The manifest records where its last flushed index ends: an interrupted
+        # container grew past it, it is cut back there and that index tells which frames it already holds
+        properties, _ = get_ply_properties(config)
+        resume_end = manifest["files"].get(PACK_FILE) if config.resume == "Yes" else None
+        pack_writer = FramePackWriter(os.path.join(output_path, PACK_FILE), properties, resume_end)
+        completed = set(pack_writer.frame_names())
+
+    # Frames are converted in groups starting with a keyframe, a group is converted again if any of its files is missing
+    group_size = config.delta_keyframe_interval or 1
+    groups = [[(frame_name, output_file_name(frame_name, position, config))
+               for position, frame_name in enumerate(selected_frames[start:start + group_size], start)]
+              for start in range(0, len(selected_frames), group_size)]
+    if config.delta_keyframe_interval:
+        completed = delta_groups_completed(output_path, groups, completed, manifest)
+    groups = [group for group in groups if any(output_name not in completed for _, output_name in group)]
+    pending_frames = [frame_name for group in groups for frame_name, _ in group]
+    if completed:
+        tqdm.write(f"Resuming: {len(completed)} frames already converted in '{output_path}'.")
+
+    def flush_outputs():
+        if pack_writer is not None:
+            pack_writer.flush()
+            manifest["files"] = {PACK_FILE: pack_writer.index_end}
+        write_manifest(output_path, manifest)
+
+    try:
+        parsed_frames = {}
+        if pending_frames and (config.single_pass == "Yes" or cache_path):
+            # Read every frame once: rendering states feed the visibility scores, parsed actors feed the conversion
+            parsed_frames, visibility_scores = ingest_participant_frames(frames_path, pending_frames, cache_path)
+            for frame_name, packed_frame in parsed_frames.items():
+                frame_number = int(re.findall(r'\d+', frame_name)[0])
+                packed_frame.set_scores(visibility_scores.frame_scores(frame_number))
+
+        tasks = [[(os.path.join(frames_path, frame_name), os.path.join(output_path, output_name), parsed_frames.pop(frame_name, None))
+                  for frame_name, output_name in group] for group in groups]
+
+        if config.actor_block_cache is not None:
+            config.actor_block_cache.reset()
+
+        last_flush = time.time()
+        with tqdm(total=len(pending_frames), desc="Processing frames", leave=False) as progress:
+            for group, group_results in run_frame_tasks(tasks, config):
+                for (frame_path, output_file_path, _), (error, encoded_frame) in zip(group, group_results):
+                    output_name = os.path.basename(output_file_path)
+                    if error:
+                        if pack_writer is not None:
+                            pack_writer.remove(output_name)
+                        manifest["files"].pop(output_name, None)
+                        tqdm.write(error, file=sys.stderr)
+                    elif pack_writer is not None:
+                        pack_writer.append(output_name, *encoded_frame)
+                    else:
+                        manifest["files"][output_name] = os.path.getsize(output_file_path)
+                progress.update(len(group))
+
+                if time.time() - last_flush > MANIFEST_FLUSH_INTERVAL:
+                    flush_outputs()
+                    last_flush = time.time()
+    finally:
+        flush_outputs()
+        if pack_writer is not None:
+            pack_writer.close()
+
+    if config.actor_block_cache is not None:
+        tqdm.write(config.actor_block_cache.summary())
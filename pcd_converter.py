@@ -1,6 +1,98 @@
 import numpy as np
+from functools import lru_cache
 from scipy.spatial.transform import Rotation as R
 
+SUBSAMPLE_SEED = 42
+
+@lru_cache(maxsize=256)
+def subsample_indices(num_points, point_budget):
+    """
+    Deterministic indices of the points kept when an asset exceeds its point budget.
+
+    The indices come from a local random generator seeded for every call, so they only depend on the asset size and
+    the budget, and they select the same points as shuffling the asset with the global generator seeded with 42.
+
+    Parameters:
+    num_points (int): Number of points of the asset.
+    point_budget (int): Maximum number of points to keep.
+
+    Returns:
+    numpy.ndarray or None: Read-only array of point_budget indices, or None if the asset fits in the budget.
+    """
+    if num_points <= point_budget:
+        return None
+    indices = np.random.RandomState(SUBSAMPLE_SEED).permutation(num_points)[:point_budget]
+    indices.setflags(write=False)
+    return indices
+
+@lru_cache(maxsize=1024)
+def rotation_matrix(rotation):
+    """
+    Rotation matrix of (rx, ry, rz) Euler angles in degrees, applied as 'xyz'.
+
+    Parameters:
+    rotation (tuple): (rx, ry, rz) rotation angles in degrees.
+
+    Returns:
+    numpy.ndarray: Read-only (3, 3) rotation matrix.
+    """
+    quat = R.from_euler('xyz', rotation, degrees=True).as_quat()
+    matrix = R.from_quat(quat).as_matrix()
+    matrix.setflags(write=False)
+    return matrix
+
+def subsample_points(points, point_cap):
+    """
+    Keep a deterministic subset of at most point_cap points. The input array is never modified.
+
+    Parameters:
+    points (numpy.ndarray): Array of (x, y, z, ...) coordinates.
+    point_cap (float): Maximum number of points to keep.
+
+    Returns:
+    numpy.ndarray: The kept points, or the input array itself if it fits in the cap.
+    """
+    indices = subsample_indices(len(points), int(point_cap))
+    return points if indices is None else points[indices]
+
+def apply_transformations_batch(point_sets, centers, scales, rotations):
+    """
+    Apply scaling, rotation, and translation transformations to several point sets at once.
+    The sets are concatenated without padding, each segment is rotated by its own matrix and the scaling and
+    translation run on the whole array. The input arrays are not modified.
+
+    Parameters:
+    point_sets (list of numpy.ndarray): Arrays of (x, y, z, ...) coordinates.
+    centers (list of tuple): (x, y, z) coordinates of the translation center of each set.
+    scales (list of tuple): (sx, sy, sz) scaling factors of each set.
+    rotations (list of tuple): (rx, ry, rz) rotation angles in degrees of each set.
+
+    Returns:
+    list of numpy.ndarray: Arrays of transformed points.
+    """
+    if not point_sets:
+        return []
+
+    lengths = [len(points) for points in point_sets]
+    bounds = np.concatenate(([0], np.cumsum(lengths)))
+    coordinates = np.concatenate([points[:, :3] for points in point_sets], dtype=np.float64)
+    # Negate the X-axis
+    coordinates[:, 0] = -coordinates[:, 0]
+
+    rotated = np.empty_like(coordinates)
+    for index, rotation in enumerate(rotations):
+        start, end = bounds[index], bounds[index + 1]
+        if end > start:
+            matrix = rotation_matrix((float(rotation[0]), float(rotation[1]), float(rotation[2]) + 180))
+            # The product of one segment is the one Rotation.apply computes, so results match it bit for bit
+            np.matmul(coordinates[start:end], matrix.T, out=rotated[start:end])
+
+    points_scaled = rotated * np.repeat(np.asarray(scales, dtype=np.float64), lengths, axis=0)
+    points_translated = points_scaled + np.repeat(np.asarray(centers, dtype=np.float64), lengths, axis=0)
+    # Concatenate with unchanged dimensions
+    return [np.concatenate((points_translated[bounds[index]:bounds[index + 1]], points[:, 3:]), axis=1)
+            for index, points in enumerate(point_sets)]
+
 def apply_transformations(points, center, scale, rotation, point_cap):
     """
     Apply scaling, rotation, and translation transformations to points.
@@ -14,17 +106,5 @@ def apply_transformations(points, center, scale, rotation, point_cap):
     Returns:
     numpy.ndarray: Array of transformed points.
     """
-    nb_points = len(points)
-    if(point_cap < nb_points): 
-        np.random.seed(42)
-        np.random.shuffle(points)
-        points = points[:int(point_cap)]
-    #inverted_rotation = [-angle for angle in rotation]
-    rotation = (rotation[0],rotation[1],rotation[2]+180)
-    # Negate the X-axis
-    points[:, 0] = -points[:, 0]
-    quat = R.from_euler('xyz', rotation, degrees=True).as_quat()
-    points_rotated = R.from_quat(quat).apply(points[:, :3])  # Apply rotation only to first three dimensions
-    points_scaled = points_rotated * np.array(scale)
-    points_translated = points_scaled + np.array(center)
-    return np.concatenate((points_translated, points[:, 3:]), axis=1)  # Concatenate with unchanged dimensions
\ No newline at end of file
+    points = subsample_points(points, point_cap)
+    return apply_transformations_batch([points], [center], [scale], [rotation])[0]
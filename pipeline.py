@@ -0,0 +1,123 @@
+import time
+import queue
+import threading
+import traceback
+
+_END = object()
+
+class PipelineStage:
+    """
+    One step of a Pipeline: a function applied to every item by one or more threads.
+    """
+
+    def __init__(self, name, function, threads=1):
+        """
+        Args:
+            name (str): Name of the stage, used in the utilization report.
+            function (callable): Function receiving the output of the previous stage and returning the input of the next one.
+            threads (int, optional): Number of threads running the stage. Items may leave a stage with several threads
+                out of order. Default is 1.
+        """
+        self.name = name
+        self.function = function
+        self.threads = max(1, int(threads))
+        self.busy_time = 0.0
+        self.items = 0
+        self._lock = threading.Lock()
+
+    def record(self, busy_time):
+        with self._lock:
+            self.busy_time += busy_time
+            self.items += 1
+
+class Pipeline:
+    """
+    Runs items through a sequence of stages connected by bounded queues, so that a slow stage (for example disk writes)
+    overlaps with the others instead of running after them.
+
+    Every item travels as (key, payload, error). When a stage raises, the error report is attached to the item and
+    the following stages pass it through unchanged, so every key comes out of the pipeline exactly once.
+    """
+
+    def __init__(self, stages, queue_depth):
+        """
+        Args:
+            stages (list): PipelineStage objects, in processing order.
+            queue_depth (int): Maximum number of items waiting in front of each stage.
+        """
+        self.stages = stages
+        self.queue_depth = max(1, int(queue_depth))
+        self.elapsed = 0.0
+
+    def _run_stage(self, stage, input_queue, output_queue, remaining, next_threads):
+        while True:
+            item = input_queue.get()
+            if item is _END:
+                # The last thread of the stage to finish tells every thread of the next stage to stop
+                with remaining["lock"]:
+                    remaining["threads"] -= 1
+                    last = remaining["threads"] == 0
+                if last:
+                    for _ in range(next_threads):
+                        output_queue.put(_END)
+                return
+
+            key, payload, error = item
+            if error is None:
+                start_time = time.perf_counter()
+                try:
+                    payload = stage.function(payload)
+                except Exception as e:
+                    payload, error = None, f"Error processing '{key}' in the {stage.name} stage: {e}\n{traceback.format_exc()}"
+                stage.record(time.perf_counter() - start_time)
+            output_queue.put((key, payload, error))
+
+    def _feed(self, items, input_queue, threads):
+        for key, payload in items:
+            input_queue.put((key, payload, None))
+        for _ in range(threads):
+            input_queue.put(_END)
+
+    def run(self, items):
+        """
+        Processes items through all stages.
+
+        Args:
+            items (iterable): (key, payload) pairs given to the first stage.
+
+        Yields:
+            tuple: (key, output of the last stage or None, error report or None), in completion order.
+        """
+        queues = [queue.Queue(maxsize=self.queue_depth) for _ in self.stages]
+        # The results queue is unbounded so the stages never wait for the consumer
+        queues.append(queue.Queue())
+
+        threads = [threading.Thread(target=self._feed, args=(items, queues[0], self.stages[0].threads), daemon=True)]
+        for position, stage in enumerate(self.stages):
+            next_threads = self.stages[position + 1].threads if position + 1 < len(self.stages) else 1
+            remaining = {"threads": stage.threads, "lock": threading.Lock()}
+            for _ in range(stage.threads):
+                threads.append(threading.Thread(target=self._run_stage, daemon=True,
+                                                args=(stage, queues[position], queues[position + 1], remaining, next_threads)))
+
+        start_time = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _END:
+                    break
+                yield item
+        finally:
+            self.elapsed += time.perf_counter() - start_time
+
+    def summary(self):
+        """
+        Returns a one-line report of the share of time each stage's threads spent working, to spot the bottleneck.
+        """
+        utilization = []
+        for stage in self.stages:
+            share = 100.0 * stage.busy_time / (self.elapsed * stage.threads) if self.elapsed else 0.0
+            utilization.append(f"{stage.name} {share:.0f}%" + (f" ({stage.threads} threads)" if stage.threads > 1 else ""))
+        return f"Pipeline utilization (queue depth {self.queue_depth}): " + ", ".join(utilization) + "."
@@ -0,0 +1,233 @@
+import os
+import numpy as np
+
+PLY_TYPES = {
+    "char": np.int8, "int8": np.int8, "uchar": np.uint8, "uint8": np.uint8,
+    "short": np.int16, "int16": np.int16, "ushort": np.uint16, "uint16": np.uint16,
+    "int": np.int32, "int32": np.int32, "uint": np.uint32, "uint32": np.uint32,
+    "float16": np.float16, "float": np.float32, "float32": np.float32, "double": np.float64, "float64": np.float64,
+}
+
+BYTE_ORDERS = {"binary_little_endian": "<", "binary_big_endian": ">", "ascii": "="}
+
+def dtype_from_properties(property_lines, byte_order="<"):
+    """
+    Builds the structured dtype of the vertices from PLY property lines.
+
+    Args:
+        property_lines (list): Lines of the form 'property <type> <name>'.
+        byte_order (str, optional): NumPy byte order character of the body. Default is '<' (little endian).
+
+    Returns:
+        numpy.dtype: Structured dtype with one field per property.
+    """
+    properties = []
+    for line in property_lines:
+        _, ply_type, name = line.split()
+        if ply_type not in PLY_TYPES:
+            raise ValueError(f"Unsupported property type '{ply_type}'.")
+        properties.append((name, PLY_TYPES[ply_type]))
+    return np.dtype(properties).newbyteorder(byte_order)
+
+def read_ply_header(file_path):
+    """
+    Parses the header of a PLY file with a single vertex element, as written by save_ply.
+
+    Args:
+        file_path (str): Path to the PLY file.
+
+    Returns:
+        tuple: (format name, number of points, structured numpy dtype, list of header comments, byte offset of the body)
+    """
+    comments = []
+    property_lines = []
+    num_points = 0
+    ply_format = None
+    with open(file_path, 'rb') as file:
+        if file.readline().strip() != b"ply":
+            raise ValueError(f"'{file_path}' is not a PLY file.")
+        while True:
+            raw_line = file.readline()
+            if not raw_line:
+                raise ValueError(f"Unexpected end of header in '{file_path}'.")
+            line = raw_line.decode('utf-8').strip()
+            if line == "end_header":
+                break
+            if line.startswith("comment "):
+                comments.append(line[len("comment "):])
+            elif line.startswith("format "):
+                ply_format = line.split()[1]
+            elif line.startswith("element "):
+                _, element, count = line.split()
+                if element != "vertex":
+                    raise ValueError(f"Unsupported element '{element}' in '{file_path}'.")
+                num_points = int(count)
+            elif line.startswith("property "):
+                property_lines.append(line)
+        body_offset = file.tell()
+
+    if ply_format not in BYTE_ORDERS:
+        raise ValueError(f"Unsupported PLY format '{ply_format}' in '{file_path}'.")
+    try:
+        point_dtype = dtype_from_properties(property_lines, BYTE_ORDERS[ply_format])
+    except ValueError as e:
+        raise ValueError(f"{e} File: '{file_path}'.") from e
+    return ply_format, num_points, point_dtype, comments, body_offset
+
+def _read_ascii_body(file_path, body_offset, num_points, point_dtype):
+    """
+    Parses an ASCII body in one bulk conversion instead of line by line.
+    """
+    with open(file_path, 'rb') as file:
+        file.seek(body_offset)
+        text = file.read().decode('utf-8')
+    num_columns = len(point_dtype.names)
+    values = np.fromstring(text, dtype=np.float64, sep=' ')
+    if values.size != num_points * num_columns:
+        raise ValueError(f"'{file_path}' holds {values.size} values, the header announces {num_points} x {num_columns}.")
+    values = values.reshape(num_points, num_columns)
+
+    points = np.empty(num_points, dtype=point_dtype)
+    for column, name in enumerate(point_dtype.names):
+        points[name] = values[:, column]
+    return points
+
+def read_ply(file_path, mmap=True):
+    """
+    Reads the vertices of a PLY file generated by the converter (frames, deltas and StaticPCDs).
+
+    Binary bodies are returned as a read-only np.memmap structured view of the file, without copying the data.
+    ASCII bodies are parsed into a regular structured array.
+
+    Args:
+        file_path (str): Path to the PLY file.
+        mmap (bool, optional): Map binary bodies instead of reading them into memory. Default is True.
+
+    Returns:
+        tuple: (structured numpy array of the vertices, list of header comments)
+    """
+    ply_format, num_points, point_dtype, comments, body_offset = read_ply_header(file_path)
+
+    if num_points == 0:
+        return np.empty(0, dtype=point_dtype), comments
+    if ply_format == "ascii":
+        return _read_ascii_body(file_path, body_offset, num_points, point_dtype), comments
+
+    expected_size = body_offset + num_points * point_dtype.itemsize
+    if os.path.getsize(file_path) < expected_size:
+        raise ValueError(f"'{file_path}' is truncated: {os.path.getsize(file_path)} bytes, {expected_size} expected.")
+    if mmap:
+        points = np.memmap(file_path, dtype=point_dtype, mode='r', offset=body_offset, shape=(num_points,))
+    else:
+        points = np.fromfile(file_path, dtype=point_dtype, count=num_points, offset=body_offset)
+    return points, comments
+
+def quantization_from_comments(comments):
+    """
+    Returns the (scale, offset) of quantized coordinates recorded in PLY header comments, or None for float coordinates.
+    """
+    scale = offset = None
+    for comment in comments:
+        if comment.startswith("quantization_scale "):
+            scale = float(comment.split()[1])
+        elif comment.startswith("quantization_offset "):
+            offset = np.array([float(value) for value in comment.split()[1:4]])
+    if scale is None or offset is None:
+        return None
+    return scale, offset
+
+def lod_counts_from_comments(comments):
+    """
+    Returns the number of points of each level of detail recorded in PLY header comments, from the coarsest level,
+    or None for files written without levels of detail.
+    """
+    counts = [int(comment.split()[2]) for comment in comments if comment.startswith("lod ")]
+    return counts or None
+
+def read_ply_level(file_path, level, mmap=True):
+    """
+    Reads one level of detail of a PLY file written with --lod_levels. Levels are prefixes of the file, so only
+    the points of the requested level are touched.
+
+    Args:
+        file_path (str): Path to the PLY file.
+        level (int): Level to read, 0 being the coarsest. Negative values count from the finest level.
+        mmap (bool, optional): Map binary bodies instead of reading them into memory. Default is True.
+
+    Returns:
+        tuple: (structured numpy array of the vertices of the level, list of header comments)
+    """
+    points, comments = read_ply(file_path, mmap)
+    counts = lod_counts_from_comments(comments)
+    if counts is None:
+        raise ValueError(f"'{file_path}' has no levels of detail.")
+    return points[:counts[level]], comments
+
+def tile_index_from_comments(comments):
+    """
+    Returns the tiles recorded in PLY header comments as a dict of tile ids mapped to (offset, count) of their points,
+    or None for files written without tiles. Empty tiles are not listed.
+    """
+    if not any(comment.startswith("tile_grid ") for comment in comments):
+        return None
+    tiles = {}
+    for comment in comments:
+        if comment.startswith("tile "):
+            _, tile, offset, count = comment.split()
+            tiles[int(tile)] = (int(offset), int(count))
+    return tiles
+
+def read_ply_tiles(file_path, tiles, mmap=True):
+    """
+    Reads the points of some tiles of a PLY file written with --tile_grid. The points of a tile are contiguous, so
+    only the requested tiles are touched.
+
+    Args:
+        file_path (str): Path to the PLY file.
+        tiles (iterable): Ids of the tiles to read. Tiles without points are ignored.
+        mmap (bool, optional): Map binary bodies instead of reading them into memory. Default is True.
+
+    Returns:
+        tuple: (structured numpy array of the points of the tiles, in tile order, list of header comments)
+    """
+    points, comments = read_ply(file_path, mmap)
+    index = tile_index_from_comments(comments)
+    if index is None:
+        raise ValueError(f"'{file_path}' is not partitioned into tiles.")
+    blocks = [points[offset:offset + count] for offset, count in (index[tile] for tile in sorted(set(tiles)) if tile in index)]
+    return (np.concatenate(blocks) if blocks else points[:0]), comments
+
+def read_coordinates(points, comments):
+    """
+    Returns the x, y, z coordinates of PLY vertices as float64, decoding quantized coordinates.
+
+    Args:
+        points (numpy.ndarray): Structured array returned by read_ply.
+        comments (list): Header comments returned by read_ply.
+
+    Returns:
+        numpy.ndarray: (N, 3) array of coordinates.
+    """
+    coordinates = np.stack([points['x'], points['y'], points['z']], axis=1).astype(np.float64)
+    quantization = quantization_from_comments(comments)
+    if quantization is not None:
+        scale, offset = quantization
+        coordinates = offset + coordinates * scale
+    return coordinates
+
+def read_static_pcds(static_folder, mmap=True):
+    """
+    Reads every PLY file of a StaticPCDs folder.
+
+    Args:
+        static_folder (str): Path to the StaticPCDs folder of an experiment.
+        mmap (bool, optional): Map binary bodies instead of reading them into memory. Default is True.
+
+    Returns:
+        dict: Actor names (file names without extension) mapped to their structured vertex arrays, sorted by name.
+    """
+    static_pcds = {}
+    for file_name in sorted(os.listdir(static_folder)):
+        if file_name.endswith(".ply"):
+            static_pcds[file_name[:-len(".ply")]], _ = read_ply(os.path.join(static_folder, file_name), mmap)
+    return static_pcds
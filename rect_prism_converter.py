@@ -1,5 +1,6 @@
 import numpy as np
 import sys
+from collections import OrderedDict
 
 def order_points_3d(points):
     """
@@ -157,31 +158,234 @@ def interpolate_face(p1, p2, p3, p4, points_per_unit_length):
 
     return np.vstack((grid_points[0].flatten(), grid_points[1].flatten(), grid_points[2].flatten())).T
 
-def generate_prism_faces(points, points_per_unit_length):
+# Corner indices of the six faces, in the ordering produced by order_points_3d
+PRISM_FACES = np.array([
+    [0, 1, 3, 2], # Bottom face
+    [4, 5, 7, 6], # Top face
+    [0, 1, 5, 4], # side
+    [2, 3, 7, 6], # side
+    [3, 1, 5, 7], # side
+    [0, 4, 6, 2]  # side
+])
+
+def _row_norms(vectors):
+    """
+    Euclidean norm of each row, computed like np.linalg.norm on a single vector so both give identical results.
+    """
+    return np.sqrt(np.matmul(vectors[:, np.newaxis, :], vectors[:, :, np.newaxis])[:, 0, 0])
+
+def order_points_3d_batch(corners):
+    """
+    Order the corners of several prisms like order_points_3d: the four lowest corners first, each half sorted by (x, y).
+
+    Parameters:
+    corners (numpy.ndarray): (M, 8, 3) array of prism corners.
+
+    Returns:
+    numpy.ndarray: (M, 8, 3) array of ordered corners.
+    """
+    z_order = np.argsort(corners[:, :, 2], axis=1)
+    sorted_corners = np.take_along_axis(corners, z_order[:, :, np.newaxis], axis=1)
+    for half in (slice(0, 4), slice(4, 8)):
+        points = sorted_corners[:, half]
+        xy_order = np.lexsort((points[:, :, 1], points[:, :, 0]), axis=-1)
+        sorted_corners[:, half] = np.take_along_axis(points, xy_order[:, :, np.newaxis], axis=1)
+    return sorted_corners
+
+def order_points_rect_batch(faces):
+    """
+    Order the corners of several rectangles counterclockwise around their centroid, like order_points_rect.
+
+    Parameters:
+    faces (numpy.ndarray): (F, 4, 3) array of rectangle corners.
+
+    Returns:
+    numpy.ndarray: (F, 4, 3) array of ordered corners.
+    """
+    centroids = np.mean(faces, axis=1)
+    normals = np.cross(faces[:, 1] - faces[:, 0], faces[:, 2] - faces[:, 0])
+    normals = normals / _row_norms(normals)[:, np.newaxis]
+
+    x_axes = np.cross(np.array([0, 0, 1]), normals)
+    vertical = _row_norms(x_axes) == 0
+    x_axes[vertical] = np.cross(np.array([0, 1, 0]), normals[vertical])
+    x_axes = x_axes / _row_norms(x_axes)[:, np.newaxis]
+    y_axes = np.cross(normals, x_axes)
+
+    transforms = np.stack((x_axes, y_axes, normals), axis=1)
+    projected = np.matmul(faces - centroids[:, np.newaxis], transforms.transpose(0, 2, 1))
+    angles = np.arctan2(projected[:, :, 1], projected[:, :, 0])
+    return np.take_along_axis(faces, np.argsort(angles, axis=1)[:, :, np.newaxis], axis=1)
+
+def generate_prism_faces_batch(corners, points_per_unit_length, template_cache=None):
+    """
+    Generate interpolated points on the faces of many rectangular prisms in one vectorized pass.
+    The points of each prism are identical to generate_prism_faces on that prism.
+
+    Parameters:
+    corners (numpy.ndarray or list): (M, 8, 3) corners of the prisms.
+    points_per_unit_length (float): Number of points per unit length of the edges.
+    template_cache (PrismTemplateCache, optional): Cache of face grids reused for prisms with the same shape. Default is None.
+
+    Returns:
+    tuple: ((P, 3) array with the face points of all prisms one after the other,
+            (M + 1,) array of offsets, the points of prism i being points[offsets[i]:offsets[i + 1]])
+    """
+    if template_cache is not None:
+        return template_cache.generate(corners, points_per_unit_length)
+
+    corners = np.asarray(corners, dtype=np.float64).reshape(-1, 8, 3)
+    num_prisms = len(corners)
+    if num_prisms == 0:
+        return np.empty((0, 3)), np.zeros(1, dtype=np.int64)
+
+    faces = order_points_3d_batch(corners)[:, PRISM_FACES].reshape(-1, 4, 3)
+    faces = order_points_rect_batch(faces)
+
+    # Grid size of each face from its edge lengths
+    edge1 = _row_norms(faces[:, 1] - faces[:, 0])
+    edge2 = _row_norms(faces[:, 2] - faces[:, 1])
+    num_points_u = (points_per_unit_length * edge1).astype(np.int64) + 1
+    num_points_v = (points_per_unit_length * edge2).astype(np.int64) + 1
+    face_sizes = num_points_u * num_points_v
+
+    # Face and position in the (v, u) grid of every output point
+    face_index = np.repeat(np.arange(len(faces)), face_sizes)
+    face_starts = np.cumsum(face_sizes) - face_sizes
+    local_index = np.arange(face_sizes.sum()) - face_starts[face_index]
+    u_index = local_index % num_points_u[face_index]
+    v_index = local_index // num_points_u[face_index]
+
+    # Parameters come from one np.linspace per distinct grid size, so they match the per-face computation exactly
+    sizes = np.unique(np.concatenate((num_points_u, num_points_v)))
+    table_offsets = np.zeros(sizes.max() + 1, dtype=np.int64)
+    table_offsets[sizes] = np.cumsum(sizes) - sizes
+    table = np.concatenate([np.linspace(0, 1, size) for size in sizes])
+    u = table[table_offsets[num_points_u[face_index]] + u_index][:, np.newaxis]
+    v = table[table_offsets[num_points_v[face_index]] + v_index][:, np.newaxis]
+
+    p1, p2, p3, p4 = (faces[face_index, corner] for corner in range(4))
+    points = (1 - u) * (1 - v) * p1 + u * (1 - v) * p2 + u * v * p3 + (1 - u) * v * p4
+
+    prism_sizes = face_sizes.reshape(num_prisms, len(PRISM_FACES)).sum(axis=1)
+    offsets = np.zeros(num_prisms + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(prism_sizes)
+    return points, offsets
+
+def generate_prism_faces(points, points_per_unit_length, template_cache=None):
     """
     Generate interpolated points on the faces of a rectangular prism.
 
     Parameters:
     points (list of tuple): List of (x, y, z) coordinates of the prism corners.
     points_per_unit_length (int): Number of points per unit length of the edges.
+    template_cache (PrismTemplateCache, optional): Cache of face grids reused for prisms with the same shape. Default is None.
 
     Returns:
     numpy.ndarray: Array of interpolated points on the prism faces.
     """
-    ordered_points = order_points_3d(points)
+    if np.shape(points) == (8, 3):
+        return generate_prism_faces_batch([points], points_per_unit_length, template_cache)[0]
 
-    faces = [
-        [ordered_points[0], ordered_points[1], ordered_points[3], ordered_points[2]], # Bottom face
-        [ordered_points[4], ordered_points[5], ordered_points[7], ordered_points[6]], # Top face
-        [ordered_points[0], ordered_points[1], ordered_points[5], ordered_points[4]], # side
-        [ordered_points[2], ordered_points[3], ordered_points[7], ordered_points[6]], # side
-        [ordered_points[3], ordered_points[1], ordered_points[5], ordered_points[7]], # side
-        [ordered_points[0], ordered_points[4], ordered_points[6], ordered_points[2]]  # side
-    ]
+    ordered_points = order_points_3d(points)
 
     interpolated_faces = []
-    for face in faces:
-        interpolated_points = interpolate_face(face[0], face[1], face[2], face[3], points_per_unit_length)
+    for face in PRISM_FACES:
+        interpolated_points = interpolate_face(*ordered_points[face], points_per_unit_length)
         interpolated_faces.append(interpolated_points)
 
     return np.vstack(interpolated_faces)
+
+class PrismTemplateCache:
+    """
+    Bounded LRU cache of prism face grids, for scenes made of many identical boxes (e.g. maze walls).
+
+    A template holds the face points of a prism relative to its first ordered corner. It is keyed by the other corners
+    relative to that one, rounded to a tolerance, which captures the edge lengths and the orientation of the prism,
+    and by the density. A prism matching a template is generated by translating the template to its first corner.
+    """
+
+    def __init__(self, max_templates, tolerance=0.001):
+        """
+        Args:
+            max_templates (int): Maximum number of cached templates. The least recently used ones are evicted first.
+            tolerance (float, optional): Resolution at which corner offsets are compared, in scene units. Default is 0.001.
+        """
+        self.max_templates = int(max_templates)
+        self.tolerance = float(tolerance)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._templates = OrderedDict()
+
+    def __len__(self):
+        return len(self._templates)
+
+    def __getstate__(self):
+        # Worker processes start with an empty cache of the same size instead of a copy of the templates
+        state = self.__dict__.copy()
+        state.update(hits=0, misses=0, evictions=0, _templates=OrderedDict())
+        return state
+
+    def _insert(self, key, template):
+        if self.max_templates <= 0:
+            return
+        while len(self._templates) >= self.max_templates:
+            self._templates.popitem(last=False)
+            self.evictions += 1
+        template.setflags(write=False)
+        self._templates[key] = template
+
+    def generate(self, corners, points_per_unit_length):
+        """
+        Generate the face points of many prisms like generate_prism_faces_batch, reusing cached templates.
+
+        Parameters:
+        corners (numpy.ndarray or list): (M, 8, 3) corners of the prisms.
+        points_per_unit_length (float): Number of points per unit length of the edges.
+
+        Returns:
+        tuple: ((P, 3) array with the face points of all prisms one after the other, (M + 1,) array of offsets)
+        """
+        corners = np.asarray(corners, dtype=np.float64).reshape(-1, 8, 3)
+        # Offsets are taken in the corner order used to build the faces, so prisms sharing a key share their face layout
+        ordered_corners = order_points_3d_batch(corners)
+        origins = ordered_corners[:, 0]
+        quantized = np.round((ordered_corners - origins[:, np.newaxis]) / self.tolerance).astype(np.int64)
+        keys = [(points_per_unit_length, offsets.tobytes()) for offsets in quantized]
+
+        templates = {}
+        for key in keys:
+            if key not in templates and key in self._templates:
+                self._templates.move_to_end(key)
+                templates[key] = self._templates[key]
+
+        # Unknown shapes are generated together, one prism per shape, which then becomes the template of its shape
+        representatives = {}
+        for index, key in enumerate(keys):
+            if key not in templates:
+                representatives.setdefault(key, index)
+        generated = {}
+        if representatives:
+            pending = list(representatives.values())
+            points, offsets = generate_prism_faces_batch(corners[pending], points_per_unit_length)
+            for position, index in enumerate(pending):
+                generated[index] = points[offsets[position]:offsets[position + 1]]
+                templates[keys[index]] = generated[index] - origins[index]
+                self._insert(keys[index], templates[keys[index]])
+        self.misses += len(generated)
+        self.hits += len(keys) - len(generated)
+
+        blocks = [generated[index] if index in generated else templates[key] + origins[index] for index, key in enumerate(keys)]
+        offsets = np.zeros(len(blocks) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(block) for block in blocks])
+        return (np.concatenate(blocks) if blocks else np.empty((0, 3))), offsets
+
+    def summary(self):
+        """
+        Returns a one-line human readable summary of the cache counters.
+        """
+        lookups = self.hits + self.misses
+        hit_rate = 100.0 * self.hits / lookups if lookups else 0.0
+        return (f"Prism template cache: {self.hits} hits, {self.misses} misses ({hit_rate:.1f}% hit rate), "
+                f"{self.evictions} evictions, {len(self._templates)}/{self.max_templates} templates.")
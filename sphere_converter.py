@@ -1,28 +1,33 @@
 import numpy as np
+from functools import lru_cache
 
+@lru_cache(maxsize=256)
 def fibonacci_sphere(samples, randomize=True):
     """
-    Generate points on a sphere using the Fibonacci lattice method.
+    Generate points on a unit sphere using the Fibonacci lattice method.
+    Results are cached per sample count, since spheres with the same radius and density
+    produce the same lattice in every frame.
 
     Parameters:
     samples (int): Number of points to generate.
     randomize (bool): Whether to randomize the distribution of points.
 
     Returns:
-    list of tuple: List of (x, y, z) coordinates of points on the sphere.
+    numpy.ndarray: Read-only (samples, 3) array of (x, y, z) coordinates of points on the sphere.
     """
-    points = []
-    offset = 2.0 / samples
+    offset = 2.0 / samples if samples else 0.0
     increment = np.pi * (3.0 - np.sqrt(5.0))
 
-    for i in range(samples):
-        y = ((i * offset) - 1) + (offset / 2)
-        r = np.sqrt(1 - y**2)
-        phi = ((i + (1 if randomize else 0)) % samples) * increment
-        x = np.cos(phi) * r
-        z = np.sin(phi) * r
-        points.append((x, y, z))
+    i = np.arange(samples)
+    y = ((i * offset) - 1) + (offset / 2)
+    r = np.sqrt(1 - y**2)
+    phi = ((i + (1 if randomize else 0)) % max(samples, 1)) * increment
 
+    points = np.empty((samples, 3))
+    points[:, 0] = np.cos(phi) * r
+    points[:, 1] = y
+    points[:, 2] = np.sin(phi) * r
+    points.setflags(write=False)
     return points
 
 def scale_points(points, center, radius):
@@ -30,20 +35,14 @@ def scale_points(points, center, radius):
     Scale and translate points to fit a sphere of a given radius and center.
 
     Parameters:
-    points (list of tuple): List of (x, y, z) coordinates of points.
+    points (numpy.ndarray): (N, 3) array of (x, y, z) coordinates of points.
     center (tuple): (x, y, z) coordinates of the sphere center.
     radius (float): Radius of the sphere.
 
     Returns:
     numpy.ndarray: Array of scaled and translated points.
     """
-    scaled_points = []
-    for point in points:
-        x = center[0] + radius * point[0]
-        y = center[1] + radius * point[1]
-        z = center[2] + radius * point[2]
-        scaled_points.append((x, y, z))
-    return np.array(scaled_points)
+    return np.asarray(center, dtype=np.float64) + radius * points
 
 def calculate_number_of_points(density, radius):
     """
@@ -0,0 +1,71 @@
+import numpy as np
+
+def parse_tile_grid(tile_grid):
+    """
+    Parses a tile grid given as 'X,Y,Z'.
+
+    Returns:
+        tuple: Number of tiles along x, y and z.
+    """
+    try:
+        shape = tuple(int(value) for value in tile_grid.split(","))
+    except ValueError:
+        shape = ()
+    if len(shape) != 3 or min(shape) < 1:
+        raise ValueError(f"Invalid tile grid '{tile_grid}'. Use three positive tile counts 'X,Y,Z'.")
+    return shape
+
+def tile_ids(coordinates, tile_shape, bounds):
+    """
+    Returns the tile of every point in one vectorized binning pass.
+
+    Tiles are numbered like create_tiles in the HMD plot utilities: (i * Y + j) * Z + k for the tile at index (i, j, k).
+    Points outside the bounds belong to the nearest edge tile.
+
+    Args:
+        coordinates (np.ndarray): (N, 3) array of point coordinates.
+        tile_shape (tuple): Number of tiles along x, y and z.
+        bounds (list): [[min x, min y, min z], [max x, max y, max z]] of the grid.
+
+    Returns:
+        np.ndarray: Tile id of every point.
+    """
+    shape = np.array(tile_shape, dtype=np.int64)
+    minimum = np.asarray(bounds[0], dtype=np.float64)
+    extent = np.asarray(bounds[1], dtype=np.float64) - minimum
+    # A flat axis is a single layer of tiles
+    tile_size = np.where(extent > 0, extent / shape, 1.0)
+    cells = np.floor((np.asarray(coordinates, dtype=np.float64) - minimum) / tile_size).astype(np.int64)
+    cells = np.clip(cells, 0, shape - 1)
+    return (cells[:, 0] * shape[1] + cells[:, 1]) * shape[2] + cells[:, 2]
+
+def partition_points(points, tile_shape, bounds=None):
+    """
+    Reorders the points of a file so that the points of every tile are contiguous, in tile order, and describes the
+    tiles as PLY header comments: the grid, its bounds and one 'tile <id> <offset> <count>' line per non-empty tile.
+    Points keep their original order within a tile.
+
+    Args:
+        points (np.ndarray): (N, K) points, with x, y, z in the first three columns.
+        tile_shape (tuple): Number of tiles along x, y and z.
+        bounds (list, optional): [[min x, min y, min z], [max x, max y, max z]] of the grid, shared by the files of an
+            experiment. Default is None (bounding box of the points).
+
+    Returns:
+        tuple: (reordered points, list of header comments)
+    """
+    if len(points) == 0:
+        return points, [f"tile_grid {tile_shape[0]} {tile_shape[1]} {tile_shape[2]}"]
+    if bounds is None:
+        coordinates = points[:, :3].astype(np.float64)
+        bounds = [coordinates.min(axis=0).tolist(), coordinates.max(axis=0).tolist()]
+
+    ids = tile_ids(points[:, :3], tile_shape, bounds)
+    order = np.argsort(ids, kind='stable')
+    counts = np.bincount(ids, minlength=int(np.prod(tile_shape)))
+    offsets = np.cumsum(counts) - counts
+
+    comments = [f"tile_grid {tile_shape[0]} {tile_shape[1]} {tile_shape[2]}",
+                "tile_bounds " + " ".join(repr(float(value)) for value in list(bounds[0]) + list(bounds[1]))]
+    comments += [f"tile {tile} {offsets[tile]} {counts[tile]}" for tile in np.flatnonzero(counts)]
+    return points[order], comments
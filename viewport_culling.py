@@ -0,0 +1,128 @@
+import numpy as np
+
+HMD_COLUMNS = ["Frame", "Position_X", "Position_Y", "Position_Z", "Quat_X", "Quat_Y", "Quat_Z", "Quat_W"]
+# Headset field of view, as used by the HMD plot utilities
+DEFAULT_FOV_HORIZONTAL = 97.0
+DEFAULT_FOV_VERTICAL = 93.0
+
+def quaternion_to_rotation_matrix(quaternions):
+    """
+    Converts (x, y, z, w) quaternions to rotation matrices.
+
+    Args:
+        quaternions (np.ndarray): (N, 4) array of quaternions.
+
+    Returns:
+        np.ndarray: (N, 3, 3) array of rotation matrices.
+    """
+    x, y, z, w = np.asarray(quaternions, dtype=np.float64).T
+    xx, xy, xz, xw = x * x, x * y, x * z, x * w
+    yy, yz, yw = y * y, y * z, y * w
+    zz, zw = z * z, z * w
+    return np.stack([
+        np.stack([1 - 2 * (yy + zz), 2 * (xy - zw), 2 * (xz + yw)], axis=-1),
+        np.stack([2 * (xy + zw), 1 - 2 * (xx + zz), 2 * (yz - xw)], axis=-1),
+        np.stack([2 * (xz - yw), 2 * (yz + xw), 1 - 2 * (xx + yy)], axis=-1)
+    ], axis=1)
+
+def load_hmd_poses(csv_path):
+    """
+    Reads the headset poses of a participant.
+
+    Args:
+        csv_path (str): Path to the participant's HMD_data.csv.
+
+    Returns:
+        tuple: (frame numbers sorted in increasing order, (N, 3) positions, (N, 3, 3) rotation matrices)
+    """
+    data = np.genfromtxt(csv_path, delimiter=',', names=True, dtype=np.float64)
+    data = np.atleast_1d(data)
+    missing = [column for column in HMD_COLUMNS if column not in (data.dtype.names or ())]
+    if missing:
+        raise ValueError(f"'{csv_path}' has no column {', '.join(missing)}.")
+
+    order = np.argsort(data["Frame"], kind='stable')
+    data = data[order]
+    positions = np.column_stack([data["Position_X"], data["Position_Y"], data["Position_Z"]])
+    quaternions = np.column_stack([data["Quat_X"], data["Quat_Y"], data["Quat_Z"], data["Quat_W"]])
+    # Logged quaternions are not always exactly unit length, which would scale the view axes
+    quaternions /= np.linalg.norm(quaternions, axis=1, keepdims=True)
+    rotations = quaternion_to_rotation_matrix(quaternions)
+    return data["Frame"].astype(np.int64), positions, rotations
+
+class ViewFrustum:
+    """
+    View frustum of the headset at one frame: the forward axis of the headset is its local x axis and the vertical
+    axis its local z axis, as in the HMD plot utilities.
+    """
+
+    def __init__(self, position, rotation, fov_horizontal, fov_vertical, max_distance=0):
+        self.position = np.asarray(position, dtype=np.float64)
+        self.rotation = np.asarray(rotation, dtype=np.float64)
+        self.tan_horizontal = np.tan(np.radians(fov_horizontal) / 2)
+        self.tan_vertical = np.tan(np.radians(fov_vertical) / 2)
+        self.max_distance = max_distance
+
+    def contains(self, coordinates):
+        """
+        Tests which points are in the field of view.
+
+        Args:
+            coordinates (np.ndarray): (N, 3) array of point coordinates.
+
+        Returns:
+            np.ndarray: Boolean mask of the points inside the frustum and within the distance cutoff.
+        """
+        # Coordinates in the headset frame: forward, lateral and vertical offsets
+        local = (np.asarray(coordinates, dtype=np.float64) - self.position) @ self.rotation
+        forward = local[:, 0]
+        inside = (forward > 0) & (np.abs(local[:, 1]) <= forward * self.tan_horizontal) & (np.abs(local[:, 2]) <= forward * self.tan_vertical)
+        if self.max_distance:
+            inside &= np.einsum('ij,ij->i', local, local) <= self.max_distance ** 2
+        return inside
+
+class ViewportCuller:
+    """
+    Builds the view frustum of every frame of a participant from its headset poses and counts the culled points.
+    """
+
+    def __init__(self, csv_path, fov_horizontal=DEFAULT_FOV_HORIZONTAL, fov_vertical=DEFAULT_FOV_VERTICAL, max_distance=0):
+        """
+        Args:
+            csv_path (str): Path to the participant's HMD_data.csv.
+            fov_horizontal (float, optional): Horizontal field of view in degrees. Default is 97.
+            fov_vertical (float, optional): Vertical field of view in degrees. Default is 93.
+            max_distance (float, optional): Points further from the headset are culled, 0 disables the cutoff. Default is 0.
+        """
+        self.frames, self.positions, self.rotations = load_hmd_poses(csv_path)
+        if len(self.frames) == 0:
+            raise ValueError(f"'{csv_path}' holds no headset pose.")
+        self.fov_horizontal = fov_horizontal
+        self.fov_vertical = fov_vertical
+        self.max_distance = max_distance
+        self.points_kept = 0
+        self.points_culled = 0
+
+    def frustum(self, frame_number):
+        """
+        Returns the view frustum of a frame. Frames without a pose of their own use the last pose recorded before them.
+        """
+        index = max(0, np.searchsorted(self.frames, frame_number, side='right') - 1)
+        return ViewFrustum(self.positions[index], self.rotations[index], self.fov_horizontal, self.fov_vertical, self.max_distance)
+
+    def cull(self, block, frustum):
+        """
+        Returns the points of a (N, K) block inside a frustum.
+        """
+        if len(block) == 0:
+            return block
+        inside = frustum.contains(block[:, :3])
+        kept = int(np.count_nonzero(inside))
+        self.points_kept += kept
+        self.points_culled += len(block) - kept
+        return block if kept == len(block) else block[inside]
+
+    def summary(self):
+        total = self.points_kept + self.points_culled
+        ratio = 100.0 * self.points_culled / total if total else 0.0
+        return f"Viewport culling: {self.points_culled}/{total} points outside the field of view removed ({ratio:.1f}%)."
@@ -0,0 +1,134 @@
+import numpy as np
+
+MAX_SCORE = 60
+FORGET_RATE = 14/15
+
+def polynomial_function(x):
+    """
+    Evaluates the polynomial function based on the given coefficients.
+
+    Args:
+        x (float or numpy array): Input value(s) for which the polynomial is evaluated.
+
+    Returns:
+        float or numpy array: Result of the polynomial evaluation.
+    """
+    # Coefficients of the polynomial: [a3, a2, a1, a0]
+    a3 = 2.31481481e-6
+    a2 = -1.66666667e-3
+    a1 = 3.91666667e-1
+    a0 = 3.00000000e+1
+
+    # Compute polynomial: a3*x^3 + a2*x^2 + a1*x + a0
+    y = a3 * np.power(x, 3) + a2 * np.power(x, 2) + a1 * x + a0
+
+    return y
+
+def _decay_table():
+    """
+    Builds the table of repeated forget-rate decays of the integer scores 0..MAX_SCORE.
+    Entry [v, m] is the score reached from v after m additional non-rendered frames; the last column is all zeros.
+    """
+    columns = [np.arange(MAX_SCORE + 1, dtype=np.float64)]
+    while columns[-1].any():
+        columns.append(np.floor(columns[-1] * FORGET_RATE))
+    return np.stack(columns, axis=1)
+
+DECAY_TABLE = _decay_table()
+
+def compute_score_matrix(rendered):
+    """
+    Computes the visibility scores of all actors over all frames in a few array passes.
+
+    Consecutive rendered frames ramp the score up along polynomial_function (capped at MAX_SCORE),
+    every non-rendered frame decays the previous score by the forget rate, and frames before the first
+    rendered one score 0.
+
+    Args:
+        rendered (numpy.ndarray): (actors, frames) uint8 matrix of rendering states (1 for Yes, 0 for No).
+
+    Returns:
+        numpy.ndarray: (actors, frames) float32 matrix of visibility scores.
+    """
+    rendered = np.asarray(rendered).astype(bool)
+    num_actors, num_frames = rendered.shape
+    if rendered.size == 0:
+        return np.zeros(rendered.shape, dtype=np.float32)
+
+    frame_index = np.broadcast_to(np.arange(num_frames), rendered.shape)
+
+    # Position of the last non-rendered / rendered frame up to each frame (-1 if none yet)
+    last_hidden = np.maximum.accumulate(np.where(rendered, -1, frame_index), axis=1)
+    last_rendered = np.maximum.accumulate(np.where(rendered, frame_index, -1), axis=1)
+
+    # Rendered frames: polynomial ramp of the length of the current run
+    ramp = np.minimum(polynomial_function(np.arange(num_frames + 1)), MAX_SCORE)
+    scores = np.where(rendered, ramp[frame_index - last_hidden], 0.0)
+
+    # Non-rendered frames: first decay from the score ending the previous run, then table lookups
+    hidden = ~rendered & (last_rendered >= 0)
+    rows, columns = np.nonzero(hidden)
+    run_end = last_rendered[rows, columns]
+    first_decay = np.floor(scores[rows, run_end] * FORGET_RATE).astype(np.intp)
+    steps = np.minimum(columns - run_end - 1, DECAY_TABLE.shape[1] - 1)
+    scores[rows, columns] = DECAY_TABLE[first_decay, steps]
+
+    return scores.astype(np.float32)
+
+class VisibilityScores:
+    """
+    Visibility scores of the dynamic actors of one participant, stored as dense (actors x frames) matrices.
+    Frame columns follow the frame files sorted by frame number.
+    """
+
+    def __init__(self, actors, rendered):
+        """
+        Args:
+            actors (list): Actor names, one per matrix row.
+            rendered (numpy.ndarray): (actors, frames) uint8 matrix of rendering states.
+        """
+        self.actors = list(actors)
+        self.actor_index = {actor: row for row, actor in enumerate(self.actors)}
+        self.rendered = np.asarray(rendered, dtype=np.uint8).reshape(len(self.actors), -1)
+        self.scores = compute_score_matrix(self.rendered)
+
+    @classmethod
+    def from_frame_states(cls, frame_states):
+        """
+        Builds the matrices from the rendering states read from each frame file.
+
+        Args:
+            frame_states (list): One dict per frame, in frame order, mapping actor names to 1 (rendered) or 0.
+
+        Returns:
+            VisibilityScores: Scores of all actors seen in any frame. Actors missing from a frame count as not rendered.
+        """
+        actors = {}
+        for states in frame_states:
+            for actor in states:
+                actors.setdefault(actor, len(actors))
+
+        rendered = np.zeros((len(actors), len(frame_states)), dtype=np.uint8)
+        for column, states in enumerate(frame_states):
+            for actor, value in states.items():
+                rendered[actors[actor], column] = value
+        return cls(actors, rendered)
+
+    @property
+    def num_frames(self):
+        return self.scores.shape[1]
+
+    def frame_scores(self, frame_number):
+        """
+        Returns the visibility score of every actor for one frame.
+
+        Args:
+            frame_number (int): Frame number taken from the frame file name.
+
+        Returns:
+            dict: Actor names mapped to their visibility score, or None if the frame is out of range.
+        """
+        column = frame_number - 1
+        if column >= self.num_frames or column < -self.num_frames:
+            return {actor: None for actor in self.actors}
+        return dict(zip(self.actors, self.scores[:, column].tolist()))